@@ -1,96 +1,124 @@
-import random
-import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import sys
-sys.stdout.reconfigure(encoding='utf-8')
-
-os.makedirs("rfm_reports", exist_ok=True)
-
-random.seed(42)
-
-customers = [f"CUST{i:04d}" for i in range(1, 501)]
-
-rows = []
-for cid in customers:
-    recency = random.randint(1, 365)
-    frequency = random.randint(1, 50)
-    avg_spend = random.uniform(10, 300)
-    monetary = round(frequency * avg_spend, 2)
-    rows.append({
-        "Customer_ID": cid,
-        "Recency": recency,
-        "Frequency": frequency,
-        "Monetary": monetary
-    })
-
-df = pd.DataFrame(rows)
-
-df["R_Score"] = pd.qcut(df["Recency"], 4, labels=[4, 3, 2, 1]).astype(int)
-df["F_Score"] = pd.qcut(df["Frequency"], 4, labels=[1, 2, 3, 4]).astype(int)
-df["M_Score"] = pd.qcut(df["Monetary"], 4, labels=[1, 2, 3, 4]).astype(int)
-
-df["RFM_Score"] = df["R_Score"] + df["F_Score"] + df["M_Score"]
-
-def segment_label(score):
-    if score >= 10:
-        return "Gold"
-    elif score >= 7:
-        return "Silver"
-    else:
-        return "Bronze"
-
-df["Segment"] = df["RFM_Score"].apply(segment_label)
-
-seg_summary = df.groupby("Segment", as_index=False).agg(
-    Customers=("Customer_ID", "count"),
-    Avg_Recency=("Recency", "mean"),
-    Avg_Frequency=("Frequency", "mean"),
-    Avg_Monetary=("Monetary", "mean"),
-    Total_Revenue=("Monetary", "sum")
-).sort_values("Total_Revenue", ascending=False)
-
-seg_summary["Revenue_%"] = (seg_summary["Total_Revenue"] / seg_summary["Total_Revenue"].sum() * 100).round(2)
-
-print("=== RFM Segmentation Summary ===")
-print(seg_summary.to_string(index=False))
-
-plt.figure()
-plt.bar(seg_summary["Segment"], seg_summary["Total_Revenue"])
-plt.title("Total Revenue by Customer Segment")
-plt.xlabel("Segment")
-plt.ylabel("Total Revenue")
-plt.tight_layout()
-plt.show()
-
-plt.figure()
-plt.bar(seg_summary["Segment"], seg_summary["Avg_Monetary"])
-plt.title("Average Monetary Value by Segment")
-plt.xlabel("Segment")
-plt.ylabel("Avg Monetary Value")
-plt.tight_layout()
-plt.show()
-
-plt.figure()
-plt.bar(seg_summary["Segment"], seg_summary["Customers"])
-plt.title("Number of Customers by Segment")
-plt.xlabel("Segment")
-plt.ylabel("Customers")
-plt.tight_layout()
-plt.show()
-
-priority_segment = seg_summary.loc[seg_summary["Revenue_%"].idxmax(), "Segment"]
-recommendation = f"🎯 Recommend targeting **{priority_segment} customers** for loyalty rewards and premium offers."
-secondary_segment = seg_summary.loc[seg_summary["Revenue_%"].idxmin(), "Segment"]
-discount_rec = f"💡 Suggest offering discounts to **{secondary_segment} customers** to re-engage them."
-
-print("\n=== Marketing Recommendations ===")
-print(recommendation)
-print(discount_rec)
-
-df.to_csv("rfm_reports/customer_rfm_data.csv", index=False)
-seg_summary.to_csv("rfm_reports/rfm_segment_summary.csv", index=False)
-
-print("\nFiles saved in 'rfm_reports' folder:")
-print("- customer_rfm_data.csv")
-print("- rfm_segment_summary.csv")
+import os
+import matplotlib.pyplot as plt
+import data_generators
+import rfm_engine
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+os.makedirs("rfm_reports", exist_ok=True)
+
+# SCALE multiplies the 500 base customers
+SCALE = 1.0
+# set to an order-line CSV (Customer_ID, Order_Date, Amount) to build RFM
+# from real transactions, streamed in CHUNK_SIZE rows
+TRANSACTIONS_SOURCE = None
+CHUNK_SIZE = 5_000_000
+# score with merged quantile sketches (bounded memory, ~1% edge error)
+# instead of exact pd.qcut; sketches are built per CHUNK_SIZE partition
+APPROX_SCORING = False
+SKETCH_ACCURACY = 0.01
+
+# daily job: fold DAILY_ORDERS (order lines since the last run) into the
+# per-customer state at STATE_PATH and rescore only what moved; quartile
+# edges are refreshed when they drift more than DRIFT_TOLERANCE
+INCREMENTAL = False
+DAILY_ORDERS = None
+STATE_PATH = "rfm_reports/rfm_state.json"
+# days already folded in are skipped; None uses a hash of the DAILY_ORDERS file
+BATCH_ID = None
+# Recency is measured to AS_OF; None uses today's date
+AS_OF = None
+DRIFT_TOLERANCE = 0.02
+
+# segment rule table (see rfm_engine.CLASSIC_SEGMENTS for Champions /
+# At Risk / Hibernating style segments), compiled to a score-cube lookup
+SEGMENT_RULES = rfm_engine.GOLD_SILVER_BRONZE
+segment_label = rfm_engine.SegmentRules(SEGMENT_RULES)
+
+if INCREMENTAL:
+    if DAILY_ORDERS is None:
+        raise ValueError("INCREMENTAL needs DAILY_ORDERS (a CSV of the order lines since the last run)")
+    df, changes, rebinned = rfm_engine.update_state(
+        STATE_PATH, DAILY_ORDERS,
+        labeler=segment_label, batch_id=BATCH_ID,
+        as_of=AS_OF, tolerance=DRIFT_TOLERANCE, chunksize=CHUNK_SIZE
+    )
+    print(f"Incremental update: {len(changes)} changed customers"
+          f"{' (quartile edges refreshed)' if rebinned else ''}\n")
+else:
+    if TRANSACTIONS_SOURCE:
+        df = rfm_engine.stream_rfm(TRANSACTIONS_SOURCE, chunksize=CHUNK_SIZE).frame()
+    else:
+        df = data_generators.generate("rfm", scale=SCALE, seed=42)
+
+    if APPROX_SCORING:
+        parts = [rfm_engine.rfm_sketches(df.iloc[i:i + CHUNK_SIZE], SKETCH_ACCURACY) for i in range(0, len(df), CHUNK_SIZE)]
+        edges = rfm_engine.quartile_edges(rfm_engine.merge_rfm_sketches(parts))
+        df = df.join(rfm_engine.approx_scores(df, edges))
+    else:
+        df["R_Score"] = rfm_engine.qcut_scores(df["Recency"], [4, 3, 2, 1])
+        df["F_Score"] = rfm_engine.qcut_scores(df["Frequency"], [1, 2, 3, 4])
+        df["M_Score"] = rfm_engine.qcut_scores(df["Monetary"], [1, 2, 3, 4])
+
+    df["RFM_Score"] = df["R_Score"] + df["F_Score"] + df["M_Score"]
+    df["Segment"] = segment_label(df)
+
+seg_summary = df.groupby("Segment", as_index=False, observed=True).agg(
+    Customers=("Customer_ID", "count"),
+    Avg_Recency=("Recency", "mean"),
+    Avg_Frequency=("Frequency", "mean"),
+    Avg_Monetary=("Monetary", "mean"),
+    Total_Revenue=("Monetary", "sum")
+).sort_values("Total_Revenue", ascending=False)
+
+seg_summary["Revenue_%"] = (seg_summary["Total_Revenue"] / seg_summary["Total_Revenue"].sum() * 100).round(2)
+
+print("=== RFM Segmentation Summary ===")
+print(seg_summary.to_string(index=False))
+
+plt.figure()
+plt.bar(seg_summary["Segment"], seg_summary["Total_Revenue"])
+plt.title("Total Revenue by Customer Segment")
+plt.xlabel("Segment")
+plt.ylabel("Total Revenue")
+plt.tight_layout()
+plt.show()
+
+plt.figure()
+plt.bar(seg_summary["Segment"], seg_summary["Avg_Monetary"])
+plt.title("Average Monetary Value by Segment")
+plt.xlabel("Segment")
+plt.ylabel("Avg Monetary Value")
+plt.tight_layout()
+plt.show()
+
+plt.figure()
+plt.bar(seg_summary["Segment"], seg_summary["Customers"])
+plt.title("Number of Customers by Segment")
+plt.xlabel("Segment")
+plt.ylabel("Customers")
+plt.tight_layout()
+plt.show()
+
+priority_segment = seg_summary.loc[seg_summary["Revenue_%"].idxmax(), "Segment"]
+recommendation = f"🎯 Recommend targeting **{priority_segment} customers** for loyalty rewards and premium offers."
+secondary_segment = seg_summary.loc[seg_summary["Revenue_%"].idxmin(), "Segment"]
+discount_rec = f"💡 Suggest offering discounts to **{secondary_segment} customers** to re-engage them."
+
+print("\n=== Marketing Recommendations ===")
+print(recommendation)
+print(discount_rec)
+
+if INCREMENTAL:
+    changes.to_csv("rfm_reports/customer_rfm_data_delta.csv", index=False)
+else:
+    df.to_csv("rfm_reports/customer_rfm_data.csv", index=False)
+seg_summary.to_csv("rfm_reports/rfm_segment_summary.csv", index=False)
+
+print("\nFiles saved in 'rfm_reports' folder:")
+if INCREMENTAL:
+    print("- customer_rfm_data_delta.csv (changed customers only)")
+    print(f"- {os.path.basename(STATE_PATH)} (persisted RFM state)")
+else:
+    print("- customer_rfm_data.csv")
+print("- rfm_segment_summary.csv")
@@ -1,167 +1,117 @@
-import random
-import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import sys
-sys.stdout.reconfigure(encoding='utf-8')
-
-os.makedirs("pricing_reports", exist_ok=True)
-random.seed(42)
-
-products = [f"P{i:03d}" for i in range(1, 21)]
-categories = ["Electronics", "Home", "Grocery", "Beauty"]
-weeks = [f"2025-W{w:02d}" for w in range(1, 21)]
-
-rows = []
-for pid in products:
-    cat = random.choice(categories)
-    base_price = random.uniform(8, 120)
-    price_volatility = random.uniform(0.85, 1.15)
-    base_demand = random.uniform(80, 1200)
-    price_sensitivity = random.uniform(0.6, 1.8)
-
-    for wk in weeks:
-        price = round(base_price * random.uniform(0.85, 1.15) * price_volatility, 2)
-        noise = random.uniform(0.8, 1.2)
-        units = int(max(0, (base_demand * (base_price / price) ** price_sensitivity) * noise))
-        rows.append({
-            "Product_ID": pid,
-            "Category": cat,
-            "Week": wk,
-            "Price": price,
-            "Units_Sold": units
-        })
-
-df = pd.DataFrame(rows)
-
-corr_df = (
-    df.groupby("Product_ID")
-      .apply(lambda g: g["Price"].corr(g["Units_Sold"]))
-      .reset_index(name="Corr_Price_Units")
-)
-print("=== Correlation Price vs Units (per product) ===")
-print(corr_df.head(10).to_string(index=False))
-
-def fit_linear_demand(group):
-    p = group["Price"]
-    q = group["Units_Sold"]
-    var_p = p.var()
-    if var_p == 0 or pd.isna(var_p):
-        return pd.Series({"a": pd.NA, "b": pd.NA, "P_opt": pd.NA, "Rev_opt": pd.NA})
-    cov_pq = p.cov(q)
-    b = cov_pq / var_p
-    a = q.mean() - b * p.mean()
-    if b == 0 or pd.isna(b):
-        possible_prices = [p.min(), p.max()]
-        revs = [float(possible_prices[0] * (a + b * possible_prices[0] if pd.notna(a) and pd.notna(b) else q.mean())),
-                float(possible_prices[1] * (a + b * possible_prices[1] if pd.notna(a) and pd.notna(b) else q.mean()))]
-        idx = 0 if revs[0] >= revs[1] else 1
-        return pd.Series({"a": a, "b": b, "P_opt": possible_prices[idx], "Rev_opt": revs[idx]})
-    p_opt = -a / (2 * b)
-    p_min = p.min() * 0.7
-    p_max = p.max() * 1.3
-    p_opt = max(p_min, min(p_opt, p_max))
-    q_opt = max(0.0, a + b * p_opt)
-    rev_opt = float(p_opt * q_opt)
-    return pd.Series({"a": a, "b": b, "P_opt": round(float(p_opt), 2), "Rev_opt": round(rev_opt, 2)})
-
-model_df = df.groupby(["Product_ID", "Category"], as_index=False).apply(fit_linear_demand)
-print("\n=== Fitted linear demand & optimal price (per product) ===")
-print(model_df.head(10).to_string(index=False))
-
-def simulate_curve(group, model_row):
-    p_obs = group["Price"]
-    p_min = float(p_obs.min() * 0.7)
-    p_max = float(p_obs.max() * 1.3)
-    grid = [round(p_min + i * (p_max - p_min) / 40, 2) for i in range(41)]
-    a = model_row["a"]
-    b = model_row["b"]
-    preds = []
-    for price in grid:
-        q = a + b * price if pd.notna(a) and pd.notna(b) else group["Units_Sold"].mean()
-        q = max(0.0, float(q))
-        preds.append({"Product_ID": group["Product_ID"].iloc[0],
-                      "Category": group["Category"].iloc[0],
-                      "Price": price,
-                      "Pred_Units": q,
-                      "Pred_Revenue": round(price * q, 2)})
-    return pd.DataFrame(preds)
-
-curve_list = []
-for _, row in model_df.iterrows():
-    g = df[df["Product_ID"] == row["Product_ID"]]
-    curve_list.append(simulate_curve(g, row))
-revenue_curves = pd.concat(curve_list, ignore_index=True)
-
-print("\n=== Revenue curve sample (first 12 rows) ===")
-print(revenue_curves.head(12).to_string(index=False))
-
-def simulate_strategy(group, pct_change):
-    base_avg_price = group["Price"].mean()
-    new_price = round(base_avg_price * (1 + pct_change), 2)
-    model = model_df[model_df["Product_ID"] == group["Product_ID"].iloc[0]].iloc[0]
-    a, b = model["a"], model["b"]
-    if pd.isna(a) or pd.isna(b):
-        q = group["Units_Sold"].mean()
-    else:
-        q = max(0.0, a + b * new_price)
-    rev = new_price * q
-    return pd.Series({
-        "Product_ID": group["Product_ID"].iloc[0],
-        "Category": group["Category"].iloc[0],
-        "Strategy": f"{int(pct_change*100)}%",
-        "New_Price": new_price,
-        "Expected_Units": round(q, 2),
-        "Expected_Revenue": round(rev, 2)
-    })
-
-strategies = [-0.10, 0.00, 0.10]
-sim_results = []
-for pid, g in df.groupby("Product_ID"):
-    for s in strategies:
-        sim_results.append(simulate_strategy(g, s))
-strategy_df = pd.DataFrame(sim_results)
-
-print("\n=== Simulated strategies (per product) ===")
-print(strategy_df.head(12).to_string(index=False))
-
-best_strategy = (
-    strategy_df.sort_values(["Product_ID", "Expected_Revenue"], ascending=[True, False])
-               .groupby("Product_ID", as_index=False)
-               .head(1)
-               .rename(columns={"Strategy": "Best_Strategy"})
-               [["Product_ID", "Category", "Best_Strategy", "New_Price", "Expected_Units", "Expected_Revenue"]]
-)
-
-summary = (
-    model_df.merge(corr_df, on="Product_ID", how="left")
-            .merge(best_strategy, on=["Product_ID", "Category"], how="left")
-)
-print("\n=== Optimal price & best simulated strategy (per product) ===")
-print(summary.head(10).to_string(index=False))
-
-df.to_csv("pricing_reports/pricing_weekly_raw.csv", index=False)
-corr_df.to_csv("pricing_reports/price_units_correlation.csv", index=False)
-model_df.to_csv("pricing_reports/linear_demand_and_optimal_price.csv", index=False)
-revenue_curves.to_csv("pricing_reports/revenue_curves.csv", index=False)
-strategy_df.to_csv("pricing_reports/strategy_simulations.csv", index=False)
-summary.to_csv("pricing_reports/optimal_and_best_strategy_summary.csv", index=False)
-
-print("\nFiles saved in 'pricing_reports' folder:")
-print("- pricing_weekly_raw.csv")
-print("- price_units_correlation.csv")
-print("- linear_demand_and_optimal_price.csv")
-print("- revenue_curves.csv")
-print("- strategy_simulations.csv")
-print("- optimal_and_best_strategy_summary.csv")
-
-sample_ids = summary["Product_ID"].unique()[:3]
-for pid in sample_ids:
-    curve = revenue_curves[revenue_curves["Product_ID"] == pid].sort_values("Price")
-    plt.figure()
-    plt.plot(curve["Price"], curve["Pred_Revenue"])
-    plt.title(f"Revenue Curve — {pid}")
-    plt.xlabel("Price")
-    plt.ylabel("Predicted Revenue")
-    plt.tight_layout()
-    plt.show()
+import os
+import matplotlib.pyplot as plt
+import data_generators
+import pricing_engine
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+os.makedirs("pricing_reports", exist_ok=True)
+
+# SCALE multiplies the 20 base products (20 weekly rows each)
+SCALE = 1.0
+# revenue-curve price grid per product; CURVE_ARGMAX_WINDOW = k keeps only
+# the k points either side of each curve's peak (None = whole curve)
+CURVE_POINTS = 41
+CURVE_ARGMAX_WINDOW = None
+# price moves simulated for every product (fraction of its average price),
+# e.g. [x / 100 for x in range(-30, 31)]; CATEGORY_STRATEGIES overrides the
+# list per category, e.g. {"Electronics": [-0.05, 0.0, 0.05]}
+STRATEGIES = [-0.10, 0.00, 0.10]
+CATEGORY_STRATEGIES = {}
+# bootstrap CIs for b, log-log elasticity and P_opt: BOOTSTRAP_REPS resamples
+# of each product's weeks; BOOTSTRAP_WORKERS > 1 uses a process pool
+# (needs fork, so Linux / macOS only; on Windows it warns and runs in one process)
+BOOTSTRAP_REPS = 2000
+BOOTSTRAP_WORKERS = 1
+CI_LEVEL = 0.95
+# own / cross price elasticities within each category; only pairs with
+# |t| >= CROSS_MIN_T are kept
+CROSS_MIN_T = 2.0
+# per-product stats, fits and bootstrap CIs are cached by a hash of the
+# product's weekly rows, and cross-price pairs by a hash of their category:
+# only changed products / categories are recomputed; entries unused for
+# CACHE_MAX_AGE_DAYS (or beyond CACHE_MAX_ENTRIES, least recently used
+# first) are evicted
+MODEL_CACHE_PATH = "pricing_reports/model_cache.pkl"
+CROSS_CACHE_PATH = "pricing_reports/cross_cache.pkl"
+CACHE_MAX_AGE_DAYS = 30
+CACHE_MAX_ENTRIES = None
+df = data_generators.generate("pricing", scale=SCALE, seed=42)
+
+# slopes, intercepts, correlations and P_opt / Rev_opt for every product
+# from one grouped sum of p, q, p², q², pq (P_opt clamped to 0.7·min..1.3·max),
+# plus the bootstrap CIs, recomputed only for products whose rows changed
+cache = pricing_engine.ModelCache(MODEL_CACHE_PATH, max_entries=CACHE_MAX_ENTRIES, max_age_days=CACHE_MAX_AGE_DAYS)
+stats, fit, intervals, prints = pricing_engine.fit_demand_cached(
+    df, cache, reps=BOOTSTRAP_REPS, level=CI_LEVEL, workers=BOOTSTRAP_WORKERS
+)
+print(f"Model cache: {cache.hits} reused, {cache.misses} refit ({cache.hit_rate():.0%} hit rate)\n")
+
+corr_df = fit["Corr_Price_Units"].droplevel("Category").reset_index()
+print("=== Correlation Price vs Units (per product) ===")
+print(corr_df.head(10).to_string(index=False))
+
+model_df = fit[["a", "b", "P_opt", "Rev_opt"]].reset_index()
+print("\n=== Fitted linear demand & optimal price (per product) ===")
+print(model_df.head(10).to_string(index=False))
+
+revenue_curves = pricing_engine.revenue_curves(fit, stats, points=CURVE_POINTS, argmax_window=CURVE_ARGMAX_WINDOW)
+
+print("\n=== Revenue curve sample (first 12 rows) ===")
+print(revenue_curves.head(12).to_string(index=False))
+
+strategy_df = pricing_engine.simulate_strategies(fit, stats, STRATEGIES, CATEGORY_STRATEGIES)
+
+print("\n=== Simulated strategies (per product) ===")
+print(strategy_df.head(12).to_string(index=False))
+
+best_strategy = pricing_engine.best_strategies(strategy_df)[
+    ["Product_ID", "Category", "Best_Strategy", "New_Price", "Expected_Units", "Expected_Revenue"]
+]
+
+summary = (
+    model_df.merge(corr_df, on="Product_ID", how="left")
+            .merge(best_strategy, on=["Product_ID", "Category"], how="left")
+            .merge(intervals.reset_index(), on=["Product_ID", "Category"], how="left")
+)
+print("\n=== Optimal price & best simulated strategy (per product) ===")
+print(summary.head(10).to_string(index=False))
+
+cross_cache = pricing_engine.ModelCache(
+    CROSS_CACHE_PATH, columns=pricing_engine.CROSS_COLUMNS, keys=["Category"],
+    max_entries=CACHE_MAX_ENTRIES, max_age_days=CACHE_MAX_AGE_DAYS,
+)
+cross_df = pricing_engine.cross_elasticities_cached(df, prints, cross_cache, min_t=CROSS_MIN_T)
+cross_pairs = cross_df[cross_df["Product_ID"] != cross_df["Cross_Product_ID"]]
+print(f"\n=== Significant cross-price pairs (|t| >= {CROSS_MIN_T}): {len(cross_pairs)} ===")
+print(cross_pairs.reindex(cross_pairs["T_Stat"].abs().sort_values(ascending=False).index).head(10).to_string(index=False))
+
+df.to_csv("pricing_reports/pricing_weekly_raw.csv", index=False)
+corr_df.to_csv("pricing_reports/price_units_correlation.csv", index=False)
+model_df.to_csv("pricing_reports/linear_demand_and_optimal_price.csv", index=False)
+revenue_curves.to_csv("pricing_reports/revenue_curves.csv", index=False)
+strategy_df.to_csv("pricing_reports/strategy_simulations.csv", index=False)
+summary.to_csv("pricing_reports/optimal_and_best_strategy_summary.csv", index=False)
+cross_df.to_csv("pricing_reports/cross_price_elasticities.csv", index=False)
+
+print("\nFiles saved in 'pricing_reports' folder:")
+print("- pricing_weekly_raw.csv")
+print("- price_units_correlation.csv")
+print("- linear_demand_and_optimal_price.csv")
+print("- revenue_curves.csv")
+print("- strategy_simulations.csv")
+print("- optimal_and_best_strategy_summary.csv")
+print("- cross_price_elasticities.csv")
+print(f"- {os.path.basename(MODEL_CACHE_PATH)} (per-product model cache)")
+print(f"- {os.path.basename(CROSS_CACHE_PATH)} (per-category cross-price cache)")
+
+sample_ids = summary["Product_ID"].unique()[:3]
+for pid in sample_ids:
+    curve = revenue_curves[revenue_curves["Product_ID"] == pid].sort_values("Price")
+    plt.figure()
+    plt.plot(curve["Price"], curve["Pred_Revenue"])
+    plt.title(f"Revenue Curve — {pid}")
+    plt.xlabel("Price")
+    plt.ylabel("Predicted Revenue")
+    plt.tight_layout()
+    plt.show()
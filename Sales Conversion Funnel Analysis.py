@@ -1,149 +1,119 @@
-import sys
-sys.stdout.reconfigure(encoding='utf-8')
-
-import random
-import os
-from datetime import datetime, timedelta
-import pandas as pd
-import matplotlib.pyplot as plt
-
-os.makedirs("funnel_reports", exist_ok=True)
-
-random.seed(42)
-N = 4000
-start = datetime(2025, 1, 1, 8, 0, 0)
-
-def random_dt(start_dt, days=180):
-    return start_dt + timedelta(
-        days=random.randint(0, days),
-        hours=random.randint(8, 23),
-        minutes=random.randint(0, 59)
-    )
-
-rows = []
-for i in range(N):
-    ts = random_dt(start)
-    weekday = ts.strftime("%A")
-    hour = ts.hour
-    base_view_p = 0.92
-    base_add_p = 0.38
-    base_checkout_p = 0.65
-    base_purchase_p = 0.78
-    wd_mult_map = {
-        "Monday": 0.95, "Tuesday": 0.98, "Wednesday": 1.00, "Thursday": 1.02,
-        "Friday": 1.08, "Saturday": 1.10, "Sunday": 1.05
-    }
-    wd_mult = wd_mult_map.get(weekday, 1.0)
-    if 18 <= hour <= 22:
-        hr_mult = 1.12
-    elif 12 <= hour <= 14:
-        hr_mult = 1.05
-    else:
-        hr_mult = 0.95
-
-    def happens(p):
-        return 1 if random.random() < p else 0
-
-    product_view = happens(base_view_p * wd_mult * hr_mult)
-    added_to_cart = 0
-    checkout = 0
-    purchase = 0
-    if product_view:
-        added_to_cart = happens(base_add_p * wd_mult * hr_mult)
-    if added_to_cart:
-        checkout = happens(base_checkout_p * wd_mult * hr_mult)
-    if checkout:
-        purchase = happens(base_purchase_p * wd_mult * hr_mult)
-    rows.append({
-        "Session_ID": f"SESS{100000 + i}",
-        "Timestamp": ts,
-        "Weekday": weekday,
-        "Hour": hour,
-        "Product_View": product_view,
-        "Added_to_Cart": added_to_cart,
-        "Checkout": checkout,
-        "Purchase": purchase
-    })
-
-df = pd.DataFrame(rows)
-stages = ["Product_View", "Added_to_Cart", "Checkout", "Purchase"]
-totals = df[stages].sum()
-
-def safe_rate(n, d):
-    return (n / d) if d and d != 0 else 0
-
-conversion = pd.Series({
-    "View->Add": safe_rate(totals["Added_to_Cart"], totals["Product_View"]),
-    "Add->Checkout": safe_rate(totals["Checkout"], totals["Added_to_Cart"]),
-    "Checkout->Purchase": safe_rate(totals["Purchase"], totals["Checkout"]),
-    "View->Purchase (Overall)": safe_rate(totals["Purchase"], totals["Product_View"])
-})
-
-dropoffs = pd.Series({
-    "After_View": totals["Product_View"] - totals["Added_to_Cart"],
-    "After_Add": totals["Added_to_Cart"] - totals["Checkout"],
-    "After_Checkout": totals["Checkout"] - totals["Purchase"]
-})
-
-funnel_df = pd.DataFrame({"Stage": stages, "Users": [totals[s] for s in stages]})
-print("=== FUNNEL TOTALS ===")
-print(funnel_df.to_string(index=False))
-print("\n=== CONVERSION RATES ===")
-print((conversion * 100).round(2).astype(str) + "%")
-print("\n=== DROPOFFS ===")
-print(dropoffs)
-
-weekday_order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
-weekday_funnel = df.groupby("Weekday")[stages].sum().reindex(weekday_order)
-weekday_conv = pd.DataFrame({
-    "View->Add": weekday_funnel.apply(lambda r: safe_rate(r["Added_to_Cart"], r["Product_View"]), axis=1),
-    "Add->Checkout": weekday_funnel.apply(lambda r: safe_rate(r["Checkout"], r["Added_to_Cart"]), axis=1),
-    "Checkout->Purchase": weekday_funnel.apply(lambda r: safe_rate(r["Purchase"], r["Checkout"]), axis=1),
-    "View->Purchase": weekday_funnel.apply(lambda r: safe_rate(r["Purchase"], r["Product_View"]), axis=1),
-})
-
-hourly_funnel = df.groupby("Hour")[stages].sum()
-hourly_conv = pd.DataFrame({
-    "View->Add": hourly_funnel.apply(lambda r: safe_rate(r["Added_to_Cart"], r["Product_View"]), axis=1),
-    "Add->Checkout": hourly_funnel.apply(lambda r: safe_rate(r["Checkout"], r["Added_to_Cart"]), axis=1),
-    "Checkout->Purchase": hourly_funnel.apply(lambda r: safe_rate(r["Purchase"], r["Checkout"]), axis=1),
-    "View->Purchase": hourly_funnel.apply(lambda r: safe_rate(r["Purchase"], r["Product_View"]), axis=1),
-})
-
-print("\n=== BEST WEEKDAYS (Overall View->Purchase) ===")
-print((weekday_conv["View->Purchase"].sort_values(ascending=False).head(3) * 100).round(2).astype(str) + "%")
-print("\n=== BEST HOURS (Overall View->Purchase) ===")
-print((hourly_conv["View->Purchase"].sort_values(ascending=False).head(5) * 100).round(2).astype(str) + "%")
-
-plt.figure()
-plt.barh(list(funnel_df["Stage"])[::-1], list(funnel_df["Users"])[::-1])
-plt.title("Sales Conversion Funnel (Sessions)")
-plt.xlabel("Users")
-plt.tight_layout()
-plt.show()
-
-plt.figure()
-weekday_conv["View->Purchase"].plot()
-plt.title("Overall Conversion by Weekday (View->Purchase)")
-plt.ylabel("Conversion Rate")
-plt.xlabel("Weekday")
-plt.tight_layout()
-plt.show()
-
-plt.figure()
-hourly_conv["View->Purchase"].plot()
-plt.title("Overall Conversion by Hour (View->Purchase)")
-plt.ylabel("Conversion Rate")
-plt.xlabel("Hour of Day")
-plt.tight_layout()
-plt.show()
-
-funnel_df.to_csv("funnel_reports/funnel_totals.csv", index=False)
-weekday_conv.to_csv("funnel_reports/weekday_conversion_rates.csv")
-hourly_conv.to_csv("funnel_reports/hourly_conversion_rates.csv")
-df.to_csv("funnel_reports/sessions_raw.csv", index=False)
-print("\nFiles saved in 'funnel_reports' folder:")
-print("- sessions_raw.csv")
-print("- funnel_totals.csv")
-print("- weekday_conversion_rates.csv")
-print("- hourly_conversion_rates.csv")
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import os
+import matplotlib.pyplot as plt
+import data_generators
+import funnel_engine
+
+os.makedirs("funnel_reports", exist_ok=True)
+
+# SCALE multiplies the 4,000 base sessions (e.g. SCALE = 2500 -> 10M rows)
+SCALE = 1.0
+# any ordered list of 0/1 stage columns (or event types with EVENT_SOURCE)
+FUNNEL_STAGES = ["Product_View", "Added_to_Cart", "Checkout", "Purchase"]
+# set to a session CSV (e.g. "funnel_reports/sessions_raw.csv") to aggregate
+# an existing log in chunks instead of generating new sessions
+STREAM_SOURCE = None
+# or set to a raw event CSV (User_ID, Event_Type, Timestamp; each user's
+# events contiguous) to sessionize it, splitting sessions after SESSION_GAP
+EVENT_SOURCE = None
+SESSION_GAP = "30min"
+CHUNK_SIZE = 1_000_000
+# hourly job: fold only the new batch from STREAM_SOURCE / EVENT_SOURCE into
+# the counters persisted at STATE_PATH and re-emit all reports from them
+INCREMENTAL = False
+STATE_PATH = "funnel_reports/funnel_state.json"
+# batches already folded in are skipped; None uses a hash of the source file,
+# so a landing file rewritten every hour counts as a new batch each time
+BATCH_ID = None
+
+def generated_sessions():
+    chunks = data_generators.iter_chunks("funnel", scale=SCALE, seed=42, chunk_size=CHUNK_SIZE)
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv("funnel_reports/sessions_raw.csv", mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        yield chunk
+
+stages = FUNNEL_STAGES
+labels = funnel_engine.stage_labels(stages)
+overall = f"{labels[0]}->{labels[-1]}"
+batch = EVENT_SOURCE or STREAM_SOURCE
+if INCREMENTAL and not batch:
+    raise ValueError("INCREMENTAL needs STREAM_SOURCE or EVENT_SOURCE; generated sessions would be folded in again on every run")
+if EVENT_SOURCE:
+    events = funnel_engine.read_events(EVENT_SOURCE, chunksize=CHUNK_SIZE)
+    source = funnel_engine.stream_sessionize(events, gap=SESSION_GAP, stages=stages)
+else:
+    source = STREAM_SOURCE or generated_sessions()
+if INCREMENTAL:
+    batch_id = BATCH_ID if BATCH_ID is not None else funnel_engine.file_batch_id(batch)
+    funnel = funnel_engine.update_state(STATE_PATH, source, batch_id=batch_id, chunksize=CHUNK_SIZE, stages=stages)
+else:
+    funnel = funnel_engine.stream_funnel(source, stages=stages, chunksize=CHUNK_SIZE)
+counts = funnel.counts
+
+conversion = funnel.conversion().rename({overall: f"{overall} (Overall)"})
+dropoffs = funnel.dropoffs()
+latency = funnel.latency_percentiles()
+has_latency = latency["Sessions"].sum() > 0
+
+funnel_df = funnel.funnel_table()
+print("=== FUNNEL TOTALS ===")
+print(funnel_df.to_string(index=False))
+print("\n=== CONVERSION RATES ===")
+print((conversion * 100).round(2).astype(str) + "%")
+print("\n=== DROPOFFS ===")
+print(dropoffs)
+if has_latency:
+    print("\n=== TIME BETWEEN STAGES (seconds) ===")
+    print(latency.round(1).to_string())
+
+weekday_funnel = funnel_engine.rollup(counts, "Weekday", stages)
+weekday_conv = funnel_engine.conversion_rates(weekday_funnel, stages=stages)
+
+hourly_funnel = funnel_engine.rollup(counts, "Hour", stages)
+hourly_conv = funnel_engine.conversion_rates(hourly_funnel, stages=stages)
+
+print(f"\n=== BEST WEEKDAYS (Overall {overall}) ===")
+print((weekday_conv[overall].sort_values(ascending=False).head(3) * 100).round(2).astype(str) + "%")
+print(f"\n=== BEST HOURS (Overall {overall}) ===")
+print((hourly_conv[overall].sort_values(ascending=False).head(5) * 100).round(2).astype(str) + "%")
+
+plt.figure()
+plt.barh(list(funnel_df["Stage"])[::-1], list(funnel_df["Users"])[::-1])
+plt.title("Sales Conversion Funnel (Sessions)")
+plt.xlabel("Users")
+plt.tight_layout()
+plt.show()
+
+plt.figure()
+weekday_conv[overall].plot()
+plt.title(f"Overall Conversion by Weekday ({overall})")
+plt.ylabel("Conversion Rate")
+plt.xlabel("Weekday")
+plt.tight_layout()
+plt.show()
+
+plt.figure()
+hourly_conv[overall].plot()
+plt.title(f"Overall Conversion by Hour ({overall})")
+plt.ylabel("Conversion Rate")
+plt.xlabel("Hour of Day")
+plt.tight_layout()
+plt.show()
+
+funnel_df.to_csv("funnel_reports/funnel_totals.csv", index=False)
+weekday_conv.to_csv("funnel_reports/weekday_conversion_rates.csv")
+hourly_conv.to_csv("funnel_reports/hourly_conversion_rates.csv")
+if has_latency:
+    latency.to_csv("funnel_reports/stage_latency_percentiles.csv")
+print("\nFiles saved in 'funnel_reports' folder:")
+if not batch:
+    print("- sessions_raw.csv")
+print("- funnel_totals.csv")
+print("- weekday_conversion_rates.csv")
+print("- hourly_conversion_rates.csv")
+if has_latency:
+    print("- stage_latency_percentiles.csv")
+if INCREMENTAL:
+    print(f"- {os.path.basename(STATE_PATH)} (persisted funnel state)")
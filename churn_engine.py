@@ -0,0 +1,201 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Churn analysis helpers for subscriber tables far larger than the sample
+# customer_churn_dataset.csv that ships with the repo.
+
+# compact dtypes per column of customer_churn_dataset.csv
+CHURN_DTYPES = {
+    "Customer_ID": "str",
+    "Country": "category",
+    "Age": "int8",
+    "Plan": "category",
+    "Support_Tier": "category",
+    "Monthly_Fee": "float32",
+    "Avg_Monthly_Usage_GB": "float32",
+    "Avg_Monthly_Calls": "int16",
+    "Complaints_Last_90d": "int8",
+    "Late_Payments_Last_6m": "int8",
+    "AutoPay_Enabled": "int8",
+    "Discount_Applied": "int8",
+    "Churned": "int8",
+    "Churn_Probability": "float32",
+}
+DATE_COLUMNS = ["Signup_Date"]
+# behavioural features used by the risk model (Churn_Probability is an
+# earlier model's output and is deliberately left out)
+FEATURES = [
+    "Age", "Monthly_Fee", "Avg_Monthly_Usage_GB", "Avg_Monthly_Calls",
+    "Complaints_Last_90d", "Late_Payments_Last_6m", "AutoPay_Enabled", "Discount_Applied",
+]
+
+
+def read_churn_chunks(path, chunksize=1_000_000, usecols=None):
+    names = pd.read_csv(path, nrows=0).columns
+    cols = [c for c in names if usecols is None or c in usecols]
+    yield from pd.read_csv(
+        path,
+        usecols=cols,
+        dtype={c: t for c, t in CHURN_DTYPES.items() if c in cols},
+        parse_dates=[c for c in DATE_COLUMNS if c in cols],
+        chunksize=chunksize,
+    )
+
+
+def load_churn(path, chunksize=1_000_000, usecols=None):
+    """
+    Read the churn table chunk-wise with downcast dtypes. Category columns
+    are unioned across chunks so they stay categorical after the concat.
+    """
+    chunks = list(read_churn_chunks(path, chunksize, usecols))
+    if not chunks:
+        return pd.DataFrame()
+    cats = [c for c in chunks[0].columns if isinstance(chunks[0][c].dtype, pd.CategoricalDtype)]
+    df = pd.concat([c.drop(columns=cats) for c in chunks], ignore_index=True)
+    for c in cats:
+        df[c] = pd.Series(union_categoricals([chunk[c] for chunk in chunks]), index=df.index)
+    return df[chunks[0].columns]
+
+
+def bytes_per_row(df):
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
+
+# retention slices: fee tiers and complaint buckets derived for the cube
+FEE_TIERS = ([0, 15, 25, float("inf")], ["Basic", "Standard", "Premium"])
+COMPLAINT_BUCKETS = ([0, 1, 2, float("inf")], ["0", "1", "2+"])
+CUBE_DIMS = ["Usage_Segment", "Country", "Fee_Tier", "Complaint_Bucket"]
+CUBE_METRICS = ["Customers", "Churned", "Revenue", "Churn_Rate", "ARPU"]
+
+
+def fit_logistic(df, features=FEATURES, target="Churned", max_iter=50, tol=1e-8, l2=1e-4):
+    """
+    Logistic regression on standardized features, fitted by iteratively
+    reweighted least squares (Newton steps; a small ridge term keeps them
+    stable on separable data). Returns one row per term with the
+    standardization Mean/Std and the Coefficient on the standardized scale.
+    """
+    x = df[list(features)].astype("float64")
+    mean = x.mean()
+    std = x.std(ddof=0).replace(0, 1.0)
+    X = np.column_stack([np.ones(len(x)), ((x - mean) / std).to_numpy()])
+    y = df[target].to_numpy(dtype="float64")
+    penalty = np.diag([0.0] + [l2 * len(x)] * len(features))
+    beta = np.zeros(X.shape[1])
+    for _ in range(max_iter):
+        p = 1 / (1 + np.exp(-(X @ beta)))
+        w = p * (1 - p)
+        step = np.linalg.solve((X.T * w) @ X + penalty, X.T @ (y - p) - penalty @ beta)
+        beta += step
+        if np.abs(step).max() < tol:
+            break
+    terms = ["Intercept"] + list(features)
+    return pd.DataFrame({
+        "Mean": [0.0] + mean.tolist(),
+        "Std": [1.0] + std.tolist(),
+        "Coefficient": beta,
+    }, index=pd.Index(terms, name="Term"))
+
+
+def score(df, model):
+    """Churn probability per row; the standardization is folded into raw-scale weights."""
+    features = model.index.drop("Intercept")
+    coef = model.loc[features, "Coefficient"] / model.loc[features, "Std"]
+    intercept = model.loc["Intercept", "Coefficient"] - (coef * model.loc[features, "Mean"]).sum()
+    z = df[features].to_numpy(dtype="float64") @ coef.to_numpy() + intercept
+    return pd.Series(1 / (1 + np.exp(-z)), index=df.index, name="Churn_Risk")
+
+
+def save_model(model, path):
+    model.to_csv(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def load_model(path):
+    return pd.read_csv(path, index_col="Term")
+
+
+def score_churn(source, model, chunksize=1_000_000, id_col="Customer_ID", target="Churned"):
+    """
+    Score a churn CSV (streamed in `chunksize` rows, reading only the model's
+    columns) or an in-memory DataFrame. Returns id, actual churn (when the
+    source has it) and Churn_Risk, in source row order.
+    """
+    features = list(model.index.drop("Intercept"))
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[i:i + chunksize] for i in range(0, len(source), chunksize))
+    else:
+        chunks = read_churn_chunks(source, chunksize, usecols=[id_col, target] + features)
+    scored = []
+    for chunk in chunks:
+        out = chunk[[c for c in (id_col, target) if c in chunk.columns]].copy()
+        out["Churn_Risk"] = score(chunk, model).astype("float32")
+        scored.append(out)
+    return pd.concat(scored) if scored else pd.DataFrame(columns=[id_col, "Churn_Risk"])
+
+
+def rank_risk(scores):
+    ranked = scores.sort_values("Churn_Risk", ascending=False, kind="stable").reset_index(drop=True)
+    ranked.insert(0, "Risk_Rank", np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+def add_cube_dims(df):
+    df["Fee_Tier"] = pd.cut(df["Monthly_Fee"], bins=FEE_TIERS[0], labels=FEE_TIERS[1], right=False)
+    df["Complaint_Bucket"] = pd.cut(df["Complaints_Last_90d"], bins=COMPLAINT_BUCKETS[0],
+                                    labels=COMPLAINT_BUCKETS[1], right=False)
+    return df
+
+
+def cube_cells(df, dims=CUBE_DIMS, target="Churned", fee="Monthly_Fee"):
+    """Additive counters for the finest cells; partials from chunks can be summed."""
+    revenue = df[fee].astype("float64")
+    grouped = df.groupby(list(dims), observed=True)
+    return pd.DataFrame({
+        "Customers": grouped.size(),
+        "Churned": grouped[target].sum().astype("int64"),
+        "Revenue": revenue.groupby([df[d] for d in dims], observed=True).sum(),
+    })
+
+
+def rollup_cube(cells, sets=None):
+    """
+    Every grouping set of the cells' index levels (all 2^n by default),
+    each rolled up from its smallest already-computed parent instead of the
+    raw rows. Returns one long table: a Grouping label, one column per
+    dimension ("All" where rolled up), the counters, Churn_Rate and ARPU.
+    """
+    dims = list(cells.index.names)
+    if sets is None:
+        sets = [tuple(d for i, d in enumerate(dims) if mask >> i & 1) for mask in range(2 ** len(dims))]
+    done = {tuple(dims): cells}
+    frames = []
+    for s in sorted(set(map(tuple, sets)), key=len, reverse=True):
+        if s not in done:
+            parent = min((p for p in done if set(s) <= set(p)), key=lambda p: len(done[p]))
+            src = done[parent]
+            done[s] = src.groupby(level=list(s), observed=True).sum() if s else src.sum().to_frame().T.astype(src.dtypes)
+        part = done[s].reset_index(drop=not s)
+        for d in dims:
+            part[d] = part[d].astype(str) if d in s else "All"
+        part.insert(0, "Grouping", "+".join(s) or "Total")
+        frames.append(part[["Grouping"] + dims + ["Customers", "Churned", "Revenue"]])
+    cube = pd.concat(frames, ignore_index=True)
+    cube["Churn_Rate"] = cube["Churned"] / cube["Customers"]
+    cube["ARPU"] = cube["Revenue"] / cube["Customers"]
+    return cube
+
+
+def churn_cube(df, dims=CUBE_DIMS, sets=None, target="Churned", fee="Monthly_Fee"):
+    return rollup_cube(cube_cells(df, dims, target, fee), sets)
+
+
+def cube_slice(cube, dims=(), **filters):
+    """Rows of one grouping set, e.g. cube_slice(cube, ["Country"], Fee_Tier=...) needs that set."""
+    out = cube[cube["Grouping"] == ("+".join(dims) or "Total")]
+    for col, value in filters.items():
+        out = out[out[col] == value]
+    keep = list(dims) + [c for c in CUBE_METRICS if c in out.columns]
+    return out[keep].reset_index(drop=True)
@@ -0,0 +1,256 @@
+import calendar
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Column-at-a-time synthetic data for the analytics scripts.
+# Every dataset is produced in chunks of base entities (sessions, customers,
+# products, ...) from a seeded numpy Generator, so 10-100M rows can be built
+# or streamed to CSV without ever holding one dict per row.
+
+FUNNEL_START = datetime(2025, 1, 1, 8, 0, 0)
+FUNNEL_BASE_P = {
+    "Product_View": 0.92,
+    "Added_to_Cart": 0.38,
+    "Checkout": 0.65,
+    "Purchase": 0.78,
+}
+WEEKDAY_MULT = {
+    "Monday": 0.95, "Tuesday": 0.98, "Wednesday": 1.00, "Thursday": 1.02,
+    "Friday": 1.08, "Saturday": 1.10, "Sunday": 1.05
+}
+
+PRODUCT_CATEGORIES = ["Electronics", "Home", "Beauty", "Grocery", "Sports"]
+PRODUCT_REGIONS = ["North", "South", "East", "West"]
+PRODUCT_MONTHS = pd.period_range("2024-01", "2025-09", freq="M")
+
+PRICING_CATEGORIES = ["Electronics", "Home", "Grocery", "Beauty"]
+PRICING_WEEKS = [f"2025-W{w:02d}" for w in range(1, 21)]
+
+MARKETING_CHANNELS = ["Facebook", "Email", "Google"]
+MARKETING_REGIONS = ["North", "South", "East", "West"]
+MARKETING_AGE_GROUPS = ["18-24", "25-34", "35-44", "45-54", "55+"]
+MARKETING_START = date(2025, 6, 1)
+
+HR_DEPARTMENTS = ["IT", "HR", "Finance", "Marketing", "Sales", "Operations"]
+
+
+def _ids(prefix, start, stop, width=0, offset=0):
+    nums = pd.Series(np.arange(start, stop) + offset).astype(str)
+    if width:
+        nums = nums.str.zfill(width)
+    return prefix + nums
+
+
+def _funnel(rng, start, stop, state):
+    n = stop - start
+    seconds = (
+        rng.integers(0, 181, n) * 86400
+        + rng.integers(8, 24, n) * 3600
+        + rng.integers(0, 60, n) * 60
+    )
+    ts = pd.Series(pd.Timestamp(FUNNEL_START) + pd.to_timedelta(seconds, unit="s"))
+    weekday = ts.dt.day_name()
+    hour = ts.dt.hour
+    wd_mult = weekday.map(WEEKDAY_MULT).fillna(1.0).to_numpy()
+    hr_mult = np.select(
+        [(hour >= 18) & (hour <= 22), (hour >= 12) & (hour <= 14)],
+        [1.12, 1.05],
+        default=0.95,
+    )
+    mult = wd_mult * hr_mult
+
+    # each stage can only fire if the previous one did
+    flags = {}
+    reached = np.ones(n, dtype=bool)
+    for stage, p in FUNNEL_BASE_P.items():
+        reached = reached & (rng.random(n) < p * mult)
+        flags[stage] = reached.astype("int8")
+
+    return pd.DataFrame({
+        "Session_ID": _ids("SESS", start, stop, offset=100000),
+        "Timestamp": ts,
+        "Weekday": weekday,
+        "Hour": hour,
+        **flags,
+    })
+
+
+def _rfm(rng, start, stop, state):
+    n = stop - start
+    frequency = rng.integers(1, 51, n)
+    avg_spend = rng.uniform(10, 300, n)
+    return pd.DataFrame({
+        "Customer_ID": _ids("CUST", start + 1, stop + 1, width=4),
+        "Recency": rng.integers(1, 366, n),
+        "Frequency": frequency,
+        "Monetary": (frequency * avg_spend).round(2),
+    })
+
+
+def _product(rng, start, stop, state):
+    n_prod = stop - start
+    n_month = len(PRODUCT_MONTHS)
+    n = n_prod * n_month
+
+    pid = np.repeat(_ids("P", start + 1, stop + 1, width=3).to_numpy(), n_month)
+    category = np.repeat(rng.choice(PRODUCT_CATEGORIES, n_prod), n_month)
+    base_cost = np.repeat(rng.uniform(3.0, 60.0, n_prod), n_month)
+    margin_mult = np.repeat(rng.uniform(1.2, 1.9, n_prod), n_month)
+
+    year = np.tile(PRODUCT_MONTHS.year.to_numpy(), n_prod)
+    mon = np.tile(PRODUCT_MONTHS.month.to_numpy(), n_prod)
+
+    unit_cost = (base_cost * rng.uniform(0.95, 1.10, n)).round(2)
+    unit_price = (unit_cost * margin_mult * rng.uniform(0.95, 1.10, n)).round(2)
+    base_demand = rng.integers(20, 121, n).astype(float)
+    season = np.select([np.isin(mon, [11, 12]), mon == 2], [1.25, 0.85], default=1.0)
+    base_demand = np.floor(base_demand * season)
+    trend = 1.0 + ((year - 2024) * 12 + mon) * 0.005
+    units_sold = np.floor(base_demand * trend * rng.uniform(0.8, 1.2, n)).astype(int)
+
+    return pd.DataFrame({
+        "Product_ID": pid,
+        "Category": category,
+        "Region": rng.choice(PRODUCT_REGIONS, n),
+        "Unit_Cost": unit_cost,
+        "Unit_Price": unit_price,
+        "Units_Sold": units_sold,
+        "Month": np.tile(PRODUCT_MONTHS.astype(str).to_numpy(), n_prod),
+        "Year": year,
+        "Month_Num": mon,
+        "Month_Name": np.array(calendar.month_abbr)[mon],
+    })
+
+
+def _pricing(rng, start, stop, state):
+    n_prod = stop - start
+    n_week = len(PRICING_WEEKS)
+    n = n_prod * n_week
+
+    pid = np.repeat(_ids("P", start + 1, stop + 1, width=3).to_numpy(), n_week)
+    category = np.repeat(rng.choice(PRICING_CATEGORIES, n_prod), n_week)
+    base_price = np.repeat(rng.uniform(8, 120, n_prod), n_week)
+    volatility = np.repeat(rng.uniform(0.85, 1.15, n_prod), n_week)
+    base_demand = np.repeat(rng.uniform(80, 1200, n_prod), n_week)
+    sensitivity = np.repeat(rng.uniform(0.6, 1.8, n_prod), n_week)
+
+    price = (base_price * rng.uniform(0.85, 1.15, n) * volatility).round(2)
+    noise = rng.uniform(0.8, 1.2, n)
+    units = np.floor(np.maximum(0, base_demand * (base_price / price) ** sensitivity * noise))
+
+    return pd.DataFrame({
+        "Product_ID": pid,
+        "Category": category,
+        "Week": np.tile(PRICING_WEEKS, n_prod),
+        "Price": price,
+        "Units_Sold": units.astype(int),
+    })
+
+
+def _financial(rng, start, stop, state):
+    n = stop - start
+    growth = rng.uniform(1.01, 1.05, n)
+    users = state.get("active_users", 1500) * np.cumprod(growth)
+    state["active_users"] = users[-1]
+    first = pd.Period("2024-01", freq="M") + start
+    return pd.DataFrame({
+        "Month": pd.period_range(first, periods=n, freq="M").astype(str),
+        "Revenue": rng.uniform(45000, 120000, n).round(2),
+        "Cost": rng.uniform(30000, 90000, n).round(2),
+        "Marketing_Spend": rng.uniform(8000, 30000, n).round(2),
+        "Active_Users": users.astype("int64"),
+        "New_Customers": rng.uniform(180, 950, n).astype(int),
+    })
+
+
+def _marketing(rng, start, stop, state):
+    n = stop - start
+    channel = rng.choice(MARKETING_CHANNELS, n)
+    channel_mult = np.select(
+        [channel == "Google", channel == "Email"],
+        [rng.uniform(1.1, 1.5, n), rng.uniform(0.6, 0.9, n)],
+        default=1.0,
+    )
+    spend = (rng.uniform(300, 5000, n) * channel_mult).round(2)
+    leads = np.floor(spend / rng.uniform(10, 60, n)).astype(int)
+    conversions = np.floor(leads * rng.uniform(0.03, 0.18, n)).astype(int)
+    revenue = (conversions * rng.uniform(40, 300, n)).round(2)
+    day = pd.Timestamp(MARKETING_START) + pd.to_timedelta(rng.integers(0, 121, n), unit="D")
+    return pd.DataFrame({
+        "Campaign_ID": _ids("CAM", start, stop, offset=1000),
+        "Channel": channel,
+        "Region": rng.choice(MARKETING_REGIONS, n),
+        "Age_Group": rng.choice(MARKETING_AGE_GROUPS, n),
+        "Date": pd.Series(day).dt.strftime("%Y-%m-%d"),
+        "Spend": spend,
+        "Leads": leads,
+        "Conversions": conversions,
+        "Revenue": revenue,
+    })
+
+
+def _hr(rng, start, stop, state):
+    n = stop - start
+    age = rng.integers(22, 59, n)
+    experience = rng.integers(1, age - 20)
+    salary = rng.integers(28000, 100001, n) + experience * rng.integers(500, 2001, n)
+    return pd.DataFrame({
+        "Employee_ID": _ids("EMP", start + 1, stop + 1, width=3),
+        "Age": age,
+        "Salary": salary,
+        "Department": rng.choice(HR_DEPARTMENTS, n),
+        "Experience": experience,
+        "Work_Hours": rng.integers(30, 61, n),
+        "Promotion_Years": rng.integers(0, 11, n),
+        "Attrition": np.where(rng.random(n) < 0.25, "Yes", "No"),
+    })
+
+
+# name -> (chunk builder, base entity count at scale=1.0)
+GENERATORS = {
+    "funnel": (_funnel, 4000),
+    "rfm": (_rfm, 500),
+    "product": (_product, 30),
+    "pricing": (_pricing, 20),
+    "financial": (_financial, 24),
+    "marketing": (_marketing, 120),
+    "hr": (_hr, 200),
+}
+
+
+def entity_count(name, scale=1.0):
+    builder, base = GENERATORS[name]
+    return max(1, int(round(base * scale)))
+
+
+def iter_chunks(name, scale=1.0, seed=42, chunk_size=1_000_000):
+    """
+    Yield the dataset `name` as DataFrames of at most `chunk_size` base entities
+    (sessions, customers, products, months, campaigns, employees).
+    Each chunk has its own RNG derived from (seed, chunk start), so the output
+    is reproducible for a given seed and chunk_size.
+    """
+    if name not in GENERATORS:
+        raise ValueError(f"Unknown dataset {name!r}; choose from {sorted(GENERATORS)}")
+    builder, _ = GENERATORS[name]
+    total = entity_count(name, scale)
+    state = {}
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        rng = np.random.default_rng([seed, start])
+        yield builder(rng, start, stop, state)
+
+
+def generate(name, scale=1.0, seed=42):
+    total = entity_count(name, scale)
+    return next(iter_chunks(name, scale=scale, seed=seed, chunk_size=total))
+
+
+def to_csv(name, path, scale=1.0, seed=42, chunk_size=1_000_000):
+    rows = 0
+    for i, chunk in enumerate(iter_chunks(name, scale=scale, seed=seed, chunk_size=chunk_size)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        rows += len(chunk)
+    return rows
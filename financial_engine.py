@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+# KPI and what-if scenario helpers for the Financial KPI Dashboard. A
+# scenario is a (marketing change, revenue elasticity, cost change) triple;
+# a grid of them is evaluated against every month in one broadcast.
+
+SCENARIO_COLUMNS = ["Scenario_ID", "Marketing_Change", "Elasticity", "Cost_Change"]
+# assumptions a scenario is compared under; the Pareto front is over the
+# marketing change within each combination of them
+ASSUMPTIONS = ("Elasticity", "Cost_Change")
+# objective -> True when higher is better
+OBJECTIVES = {"Total_Profit": True, "Profit_Margin_%": True, "CAC": False}
+
+
+def _ratio(num, den):
+    num = np.asarray(num, dtype="float64")
+    den = np.asarray(den, dtype="float64")
+    out = np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den != 0)
+    return out
+
+
+def add_kpis(df, suffix="", revenue="Revenue", cost="Cost", marketing="Marketing_Spend", customers="New_Customers"):
+    """Profit, margins, CAC and burn as column arithmetic (zero denominators -> 0)."""
+    r, c, m = df[revenue + suffix], df[cost + suffix], df[marketing + suffix]
+    df["Profit" + suffix] = r - c - m
+    df["Profit_Margin_%" + suffix] = _ratio(df["Profit" + suffix], r) * 100
+    df["CAC" + suffix] = _ratio(m, df[customers])
+    df["Burn" + suffix] = (c + m) - r
+    df["Net_Margin_%" + suffix] = _ratio(r - (c + m), r) * 100
+    return df
+
+
+def scenario_grid(marketing_changes, elasticities, cost_changes=(0.0,)):
+    """Every combination of the three lists, one row per scenario."""
+    grid = pd.MultiIndex.from_product(
+        [marketing_changes, elasticities, cost_changes],
+        names=SCENARIO_COLUMNS[1:],
+    ).to_frame(index=False)
+    grid.insert(0, "Scenario_ID", np.arange(1, len(grid) + 1))
+    return grid
+
+
+def find_scenario(grid, marketing_change, elasticity, cost_change):
+    """Scenario_ID of the grid row matching the three values (np.isclose)."""
+    match = np.ones(len(grid), dtype=bool)
+    for col, value in zip(SCENARIO_COLUMNS[1:], (marketing_change, elasticity, cost_change)):
+        match &= np.isclose(grid[col].to_numpy(dtype="float64"), value)
+    if not match.any():
+        options = "; ".join(f"{c}: {sorted(grid[c].unique().tolist())}" for c in SCENARIO_COLUMNS[1:])
+        raise ValueError(f"Scenario {(marketing_change, elasticity, cost_change)} is not in the grid ({options})")
+    return int(grid["Scenario_ID"].to_numpy()[match][0])
+
+
+def simulate(df, grid):
+    """
+    What-if KPIs for every scenario x month as (scenarios, months) matrices:
+    marketing scaled by (1 + change), revenue by (1 + elasticity x change),
+    cost by (1 + cost change). Returns the long table (one row per scenario
+    and month, actual columns next to the *_WhatIf ones) and per-scenario
+    totals.
+    """
+    mkt_change = grid["Marketing_Change"].to_numpy()[:, None]
+    elasticity = grid["Elasticity"].to_numpy()[:, None]
+    cost_change = grid["Cost_Change"].to_numpy()[:, None]
+    revenue = df["Revenue"].to_numpy()[None, :]
+    cost = df["Cost"].to_numpy()[None, :]
+    marketing = df["Marketing_Spend"].to_numpy()[None, :]
+    customers = df["New_Customers"].to_numpy()[None, :]
+
+    mkt_w = np.round(marketing * (1 + mkt_change), 2)
+    rev_w = np.round(revenue * (1 + elasticity * mkt_change), 2)
+    cost_w = np.round(cost * (1 + cost_change), 2)
+    profit_w = rev_w - cost_w - mkt_w
+    shape = profit_w.shape
+    whatif = {
+        "Revenue_WhatIf": rev_w,
+        "Cost_WhatIf": cost_w,
+        "Marketing_Spend_WhatIf": mkt_w,
+        "Profit_WhatIf": profit_w,
+        "Profit_Margin_%_WhatIf": _ratio(profit_w, rev_w) * 100,
+        "CAC_WhatIf": _ratio(mkt_w, np.broadcast_to(customers, shape)),
+    }
+
+    long = grid.loc[grid.index.repeat(shape[1])].reset_index(drop=True)
+    actual = df[["Month", "Revenue", "Cost", "Marketing_Spend", "Profit", "Profit_Margin_%", "CAC"]]
+    long = pd.concat([long, pd.concat([actual] * shape[0], ignore_index=True)], axis=1)
+    for col, values in whatif.items():
+        long[col] = values.ravel()
+
+    totals = grid.copy()
+    totals["Total_Revenue"] = rev_w.sum(axis=1)
+    totals["Total_Profit"] = profit_w.sum(axis=1)
+    totals["Profit_Margin_%"] = _ratio(totals["Total_Profit"], totals["Total_Revenue"]) * 100
+    totals["CAC"] = _ratio(mkt_w.sum(axis=1), customers.sum())
+    return long, totals
+
+
+def pareto_front(totals, objectives=OBJECTIVES, by=ASSUMPTIONS, block_size=2048):
+    """
+    Boolean mask of scenarios that no other scenario with the same `by`
+    assumptions beats on every objective (and strictly on one), checked
+    block-wise with broadcasting.
+    """
+    signs = np.array([1.0 if higher else -1.0 for higher in objectives.values()])
+    values = totals[list(objectives)].to_numpy(dtype="float64") * signs
+    groups = totals.groupby(list(by), sort=False).ngroup().to_numpy() if by else np.zeros(len(totals), dtype="int64")
+    dominated = np.zeros(len(values), dtype=bool)
+    for start in range(0, len(values), block_size):
+        block = values[start:start + block_size, None, :]
+        same = groups[None, :] == groups[start:start + block_size, None]
+        ge = (values[None, :, :] >= block).all(axis=2)
+        gt = (values[None, :, :] > block).any(axis=2)
+        dominated[start:start + block_size] = (same & ge & gt).any(axis=1)
+    return pd.Series(~dominated, index=totals.index, name="Pareto_Optimal")
+
+
+def pareto_best(totals, objectives=OBJECTIVES, by=ASSUMPTIONS):
+    """Best Pareto-optimal scenario for each objective under each set of `by` assumptions."""
+    front = totals[pareto_front(totals, objectives, by)]
+    parts = []
+    for objective, higher in objectives.items():
+        ranked = front.sort_values(list(by) + [objective], ascending=[True] * len(by) + [not higher], kind="stable")
+        parts.append(ranked.drop_duplicates(list(by)).assign(Objective=objective))
+    out = pd.concat(parts, ignore_index=True).sort_values(list(by), kind="stable", ignore_index=True)
+    return out[["Objective"] + [c for c in out.columns if c != "Objective"]]
@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+
+from parallel import process_map
+
+# Vectorized demand forecasts for many products at once. The monthly rows
+# are sorted once, laid out as a products x months matrix (one column per
+# calendar month up to the latest month in the data, NaN where a product has
+# no row) and every method steps through the months for all products together.
+
+METHODS = ["rolling_3m", "ema", "holt", "seasonal_naive"]
+# forecast column per method in the report
+METHOD_COLUMNS = {
+    "rolling_3m": "Units_Rolling_3M",
+    "ema": "Units_EMA",
+    "holt": "Units_Holt",
+    "seasonal_naive": "Units_Seasonal_Naive",
+}
+# additive backtest counters; metrics are ratios of their sums, so any
+# product / category / region level rolls up from the same table
+BACKTEST_COMPONENTS = ["Forecasts", "Actual", "Abs_Error", "Error", "APE_Sum", "APE_Count"]
+
+
+def prepare(df, id_col="Product_ID", month_col="Month"):
+    """Sort once by product and month; `Period` holds the month as period[M]."""
+    # parse each distinct month label once
+    codes, months = pd.factorize(df[month_col])
+    period = pd.PeriodIndex(pd.Index(months).astype("period[M]")).take(codes)
+    out = df.assign(Period=period)
+    return out.sort_values([id_col, "Period"], kind="stable", ignore_index=True)
+
+
+def _boundaries(ids):
+    ids = np.asarray(ids)
+    return np.flatnonzero(np.r_[ids[1:] != ids[:-1], True])
+
+
+def last_rows(sorted_df, id_col="Product_ID"):
+    """Last row of every product, found by position in the pre-sorted frame."""
+    return sorted_df.iloc[_boundaries(sorted_df[id_col])].reset_index(drop=True)
+
+
+def _layout(sorted_df, id_col):
+    # column = month offset from the latest month in the data, so a missing
+    # month stays a NaN gap instead of shifting the product's history
+    codes, ids = pd.factorize(sorted_df[id_col], sort=False)
+    ordinal = pd.PeriodIndex(sorted_df["Period"]).asi8
+    width = int(ordinal.max() - ordinal.min()) + 1 if len(ordinal) else 0
+    col = width - 1 - (ordinal.max() - ordinal) if len(ordinal) else ordinal
+    return pd.Index(ids, name=id_col), codes, col, width
+
+
+def history_matrix(sorted_df, value_col="Units_Sold", id_col="Product_ID"):
+    """
+    Products x months matrix of `value_col` with one column per calendar
+    month; column -1 is the latest month in the data and months a product
+    has no row for are NaN.
+    """
+    ids, codes, col, width = _layout(sorted_df, id_col)
+    y = np.full((len(ids), width), np.nan)
+    y[codes, col] = sorted_df[value_col].to_numpy(dtype="float64")
+    return ids, y
+
+
+def _rolling(y, window):
+    # cumulative sums shared by every origin: window sum = S[t] - S[t - window]
+    s = np.concatenate([np.zeros((len(y), 1)), np.nancumsum(y, axis=1)], axis=1)
+    c = np.concatenate([np.zeros((len(y), 1)), np.cumsum(~np.isnan(y), axis=1)], axis=1)
+    lo = np.maximum(np.arange(s.shape[1]) - window, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (s - s[:, lo]) / (c - c[:, lo])
+
+
+def _ema(y, alpha):
+    out = np.full((len(y), y.shape[1] + 1), np.nan)
+    level = np.full(len(y), np.nan)
+    for t in range(y.shape[1]):
+        obs = ~np.isnan(y[:, t])
+        level = np.where(obs, np.where(np.isnan(level), y[:, t], alpha * y[:, t] + (1 - alpha) * level), level)
+        out[:, t + 1] = level
+    return out
+
+
+def _holt(y, alpha, beta):
+    out = np.full((len(y), y.shape[1] + 1), np.nan)
+    level = np.full(len(y), np.nan)
+    trend = np.zeros(len(y))
+    for t in range(y.shape[1]):
+        obs = ~np.isnan(y[:, t])
+        first = obs & np.isnan(level)
+        new_level = alpha * y[:, t] + (1 - alpha) * (level + trend)
+        new_trend = beta * (new_level - level) + (1 - beta) * trend
+        level = np.where(first, y[:, t], np.where(obs, new_level, level))
+        trend = np.where(obs & ~first, new_trend, trend)
+        out[:, t + 1] = level + trend
+    return out
+
+
+def _seasonal_naive(y, season):
+    # same month last season; falls back to the last observed value
+    last = pd.DataFrame(y).ffill(axis=1).to_numpy()
+    out = np.full((len(y), y.shape[1] + 1), np.nan)
+    out[:, 1:] = last
+    if season <= y.shape[1]:
+        lagged = y[:, :y.shape[1] + 1 - season]
+        out[:, season:] = np.where(np.isnan(lagged), out[:, season:], lagged)
+    return out
+
+
+def one_step_forecasts(y, method, window=3, alpha=0.5, beta=0.3, season=12):
+    """
+    Forecast of every column from the columns before it, for all products:
+    result[:, t] predicts y[:, t] and result[:, -1] is next month.
+    """
+    if method == "rolling_3m":
+        return _rolling(y, window)
+    if method == "ema":
+        return _ema(y, alpha)
+    if method == "holt":
+        return _holt(y, alpha, beta)
+    if method == "seasonal_naive":
+        return _seasonal_naive(y, season)
+    raise ValueError(f"Unknown forecast method {method!r}; expected one of {METHODS}")
+
+
+def forecast(sorted_df, methods=METHODS, value_col="Units_Sold", id_col="Product_ID", **params):
+    """
+    Last row of every product plus Forecast_Month (the month after the
+    latest month in the data) and one forecast column per method for it
+    (see METHOD_COLUMNS).
+    """
+    out = last_rows(sorted_df, id_col)
+    _, y = history_matrix(sorted_df, value_col, id_col)
+    out["Forecast_Month"] = str(sorted_df["Period"].max() + 1)
+    for method in methods:
+        out[METHOD_COLUMNS[method]] = one_step_forecasts(y, method, **params)[:, -1]
+    return out
+
+
+def _backtest_block(args):
+    y, cells, n_cells, methods, min_history, params = args
+    seen = np.cumsum(~np.isnan(y), axis=1) - ~np.isnan(y)
+    size = len(y) * n_cells
+    parts = []
+    for method in methods:
+        f = one_step_forecasts(y, method, **params)[:, :-1]
+        rows, cols = np.nonzero(~np.isnan(y) & ~np.isnan(f) & (seen >= min_history))
+        actual = y[rows, cols]
+        error = f[rows, cols] - actual
+        key = rows * n_cells + cells[rows, cols]
+        pos = actual > 0
+        sums = {
+            "Forecasts": np.bincount(key, minlength=size),
+            "Actual": np.bincount(key, weights=actual, minlength=size),
+            "Abs_Error": np.bincount(key, weights=np.abs(error), minlength=size),
+            "Error": np.bincount(key, weights=error, minlength=size),
+            "APE_Sum": np.bincount(key[pos], weights=np.abs(error[pos]) / actual[pos], minlength=size),
+            "APE_Count": np.bincount(key[pos], minlength=size),
+        }
+        hit = np.flatnonzero(sums["Forecasts"])
+        part = pd.DataFrame({k: v[hit] for k, v in sums.items()})
+        part.insert(0, "Method", method)
+        part.insert(0, "Cell", hit % n_cells)
+        part.insert(0, "Row", hit // n_cells)
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def backtest(sorted_df, methods=METHODS, min_history=3, workers=1, block_size=50_000,
+             value_col="Units_Sold", id_col="Product_ID", cell_col="Region", product_cols=("Category",), **params):
+    """
+    Rolling-origin backtest: every month with at least `min_history`
+    earlier months is forecast from the months before it, by every method.
+    All origins come out of the same one-step-ahead pass (the rolling mean
+    reuses cumulative sums), so the work is split by product blocks of
+    `block_size` across `workers` processes (fork platforms; elsewhere it
+    warns and runs in-process). Returns additive error counters per product, per
+    `cell_col` value of the forecast month and per method.
+    """
+    ids, codes, col, width = _layout(sorted_df, id_col)
+    y = np.full((len(ids), width), np.nan)
+    y[codes, col] = sorted_df[value_col].to_numpy(dtype="float64")
+    cell_codes, cell_labels = pd.factorize(sorted_df[cell_col])
+    cells = np.zeros((len(ids), width), dtype="int64")
+    cells[codes, col] = cell_codes
+    tasks = [
+        (y[i:i + block_size], cells[i:i + block_size], len(cell_labels), list(methods), min_history, params)
+        for i in range(0, len(ids), block_size)
+    ]
+    parts = process_map(_backtest_block, tasks, workers)
+    for i, part in enumerate(parts):
+        part["Row"] += i * block_size
+    comp = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["Row", "Cell", "Method"] + BACKTEST_COMPONENTS)
+    static = last_rows(sorted_df, id_col)[list(product_cols)]
+    out = pd.DataFrame({id_col: ids.take(comp["Row"])})
+    for c in product_cols:
+        out[c] = static[c].to_numpy()[comp["Row"]]
+    out[cell_col] = cell_labels.take(comp["Cell"])
+    out["Method"] = comp["Method"].to_numpy()
+    out[BACKTEST_COMPONENTS] = comp[BACKTEST_COMPONENTS].to_numpy()
+    return out.astype({"Forecasts": "int64", "APE_Count": "int64"})
+
+
+def backtest_metrics(components, by):
+    """MAPE / WAPE / bias (%, forecast minus actual) per `by` level and method."""
+    g = components.groupby(list(by) + ["Method"], observed=True)[BACKTEST_COMPONENTS].sum()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = pd.DataFrame({
+            "Forecasts": g["Forecasts"],
+            "MAPE_%": g["APE_Sum"] / g["APE_Count"] * 100,
+            "WAPE_%": g["Abs_Error"] / g["Actual"] * 100,
+            "Bias_%": g["Error"] / g["Actual"] * 100,
+        })
+    return out.reset_index()
+
+
+def best_methods(metrics, by, score="WAPE_%"):
+    """Lowest-`score` method per `by` level."""
+    ranked = metrics.dropna(subset=[score]).sort_values(list(by) + [score], kind="stable")
+    return ranked.drop_duplicates(list(by)).reset_index(drop=True)
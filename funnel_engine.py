@@ -0,0 +1,319 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from streaming_stats import QuantileSketch
+
+# Chunked, mergeable funnel aggregation.
+# Sessions are folded into per-(Weekday, Hour) stage counters one chunk at a
+# time, so memory depends on the number of cells, not on the number of rows.
+
+STAGES = ["Product_View", "Added_to_Cart", "Checkout", "Purchase"]
+WEEKDAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DIMS = ["Weekday", "Hour"]
+STAGE_LABELS = {"Product_View": "View", "Added_to_Cart": "Add", "Checkout": "Checkout", "Purchase": "Purchase"}
+
+
+def stage_labels(stages=STAGES):
+    return [STAGE_LABELS.get(s, s) for s in stages]
+
+
+def latency_columns(stages=STAGES):
+    labels = stage_labels(stages)
+    return [f"{a}_to_{b}_Sec" for a, b in zip(labels[:-1], labels[1:])]
+
+
+def read_sessions(path, chunksize=1_000_000, dims=DIMS, stages=STAGES):
+    dtypes = {s: "int8" for s in stages}
+    if "Weekday" in dims:
+        dtypes["Weekday"] = "category"
+    if "Hour" in dims:
+        dtypes["Hour"] = "int8"
+    # time-to-next-stage columns are read when the log has them
+    wanted = set(dims) | set(stages) | set(latency_columns(stages))
+    yield from pd.read_csv(path, usecols=lambda c: c in wanted, dtype=dtypes, chunksize=chunksize)
+
+
+def _as_chunks(source, chunksize, dims, stages):
+    if isinstance(source, (str, os.PathLike)):
+        return read_sessions(source, chunksize=chunksize, dims=dims, stages=stages)
+    if isinstance(source, pd.DataFrame):
+        return (source.iloc[i:i + chunksize] for i in range(0, len(source), chunksize))
+    return source
+
+
+def partial_counts(chunk, dims=DIMS, stages=STAGES):
+    """
+    Stage counters for one chunk of sessions, indexed by `dims`.
+    'Sessions' counts rows so the partials can be re-aggregated later.
+    """
+    counts = chunk.groupby(list(dims), observed=True)[list(stages)].sum()
+    counts.insert(0, "Sessions", chunk.groupby(list(dims), observed=True).size())
+    return counts.astype("int64")
+
+
+def merge_counts(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left.add(right, fill_value=0).astype("int64")
+
+
+def stream_counts(source, chunksize=1_000_000, dims=DIMS, stages=STAGES):
+    """
+    Fold a session source into stage counters chunk by chunk.
+    `source` may be a CSV path, a DataFrame, or any iterable of DataFrames.
+    """
+    counts = None
+    for chunk in _as_chunks(source, chunksize, dims, stages):
+        counts = merge_counts(counts, partial_counts(chunk, dims, stages))
+    if counts is None:
+        index = pd.MultiIndex.from_arrays([[]] * len(dims), names=list(dims))
+        counts = pd.DataFrame(0, index=index, columns=["Sessions"] + list(stages), dtype="int64")
+    return counts.sort_index()
+
+
+class FunnelAccumulator:
+    """
+    One-pass summary of an ordered N-stage funnel: stage counters per `dims`
+    plus a mergeable QuantileSketch of the time between each pair of
+    consecutive stages. Update it chunk by chunk, merge partial accumulators
+    from other files or workers, then read conversion, dropoffs and latency.
+    """
+
+    def __init__(self, stages=STAGES, dims=DIMS, relative_accuracy=0.01):
+        if len(stages) < 2:
+            raise ValueError("A funnel needs at least two stages")
+        self.stages = list(stages)
+        self.dims = list(dims)
+        self.counts = None
+        self.latency = {c: QuantileSketch(relative_accuracy) for c in latency_columns(self.stages)}
+
+    def update(self, sessions):
+        self.counts = merge_counts(self.counts, partial_counts(sessions, self.dims, self.stages))
+        for col, sketch in self.latency.items():
+            if col in sessions:
+                sketch.update(sessions[col])
+        return self
+
+    def merge(self, other):
+        self.counts = merge_counts(self.counts, other.counts)
+        for col, sketch in self.latency.items():
+            sketch.merge(other.latency[col])
+        return self
+
+    def totals(self):
+        if self.counts is None:
+            return pd.Series(0, index=self.stages, dtype="int64")
+        return self.counts[self.stages].sum()
+
+    def funnel_table(self):
+        totals = self.totals()
+        return pd.DataFrame({"Stage": self.stages, "Users": totals.to_numpy()})
+
+    def conversion(self, dims=None):
+        if dims is None:
+            return conversion_rates(self.totals().to_frame().T, stages=self.stages).iloc[0].rename(None)
+        return conversion_rates(self.counts, dims=dims, stages=self.stages)
+
+    def dropoffs(self):
+        totals = self.totals().to_numpy()
+        names = [f"After_{label}" for label in stage_labels(self.stages)[:-1]]
+        return pd.Series(totals[:-1] - totals[1:], index=names)
+
+    def latency_percentiles(self, percentiles=(0.5, 0.9, 0.99)):
+        labels = stage_labels(self.stages)
+        rows = {}
+        for (a, b), sketch in zip(zip(labels[:-1], labels[1:]), self.latency.values()):
+            rows[f"{a}->{b}"] = [sketch.count] + list(sketch.quantile(list(percentiles)))
+        columns = ["Sessions"] + [f"p{p * 100:g}_Sec" for p in percentiles]
+        return pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+
+
+def stream_funnel(source, stages=STAGES, dims=DIMS, chunksize=1_000_000, relative_accuracy=0.01):
+    funnel = FunnelAccumulator(stages, dims, relative_accuracy)
+    for chunk in _as_chunks(source, chunksize, dims, stages):
+        funnel.update(chunk)
+    return funnel
+
+
+def load_state(state_path, stages=STAGES, dims=DIMS, relative_accuracy=0.01):
+    return _read_state(state_path, stages, dims, relative_accuracy)[0]
+
+
+def _read_state(state_path, stages, dims, relative_accuracy=0.01):
+    funnel = FunnelAccumulator(stages, dims, relative_accuracy)
+    if not os.path.exists(state_path):
+        return funnel, []
+    with open(state_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    counts = saved["counts"]
+    funnel.counts = pd.DataFrame(counts["data"], columns=counts["columns"]).set_index(list(dims)).astype("int64")
+    for col, d in saved["latency"].items():
+        if col in funnel.latency:
+            funnel.latency[col] = QuantileSketch.from_dict(d)
+    return funnel, saved["batches"]
+
+
+def save_state(funnel, state_path, batches=()):
+    """
+    Write counters, latency sketches and the ledger of folded batch ids as
+    one JSON document, swapped in with a single os.replace so a crash leaves
+    either the old state or the new one, never counters without their ledger.
+    """
+    state = {
+        "counts": funnel.counts.reset_index().to_dict(orient="split", index=False),
+        "latency": {c: sketch.to_dict() for c, sketch in funnel.latency.items()},
+        "batches": list(batches),
+    }
+    with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(state_path + ".tmp", state_path)
+
+
+def file_batch_id(path, block_size=1 << 20):
+    """SHA-256 of a file's bytes, so a landing file rewritten in place gets a new batch id."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def update_state(state_path, source, batch_id, chunksize=1_000_000, stages=STAGES, dims=DIMS):
+    """
+    Fold one new batch of sessions into the funnel state persisted at
+    `state_path` and return the updated FunnelAccumulator. Only the new batch
+    is scanned. A batch_id that was already folded in is skipped, so
+    re-running an hourly job on the same batch does not double count; the id
+    is recorded in the same write as the counters it produced.
+    """
+    if batch_id is None:
+        raise ValueError("update_state needs a batch_id to guard against double counting")
+    funnel, batches = _read_state(state_path, stages, dims)
+    if str(batch_id) in batches:
+        return funnel
+
+    funnel.merge(stream_funnel(source, stages, dims, chunksize))
+    funnel.counts = funnel.counts.sort_index()
+    save_state(funnel, state_path, batches + [str(batch_id)])
+    return funnel
+
+
+def rollup(counts, dim, stages=STAGES):
+    """Roll (Weekday, Hour) counters up to a single dimension."""
+    out = counts.groupby(level=dim)[list(stages)].sum()
+    if dim == "Weekday":
+        out = out.reindex(WEEKDAY_ORDER, fill_value=0)
+    return out
+
+
+def conversion_rates(data, dims=None, stages=STAGES):
+    """
+    Every stage-to-stage rate plus the overall first->last rate in one
+    columnar division; cells with a zero denominator get 0.
+    `data` is either already aggregated (dims=None) or is grouped by `dims`,
+    which may be columns or index levels (e.g. ["Weekday", "Hour", "Date"]).
+    """
+    stages = list(stages)
+    if dims is not None:
+        data = data.groupby(list(dims), observed=True)[stages].sum()
+    labels = stage_labels(stages)
+    names = [f"{a}->{b}" for a, b in zip(labels[:-1], labels[1:])] + [f"{labels[0]}->{labels[-1]}"]
+    num = data[stages[1:] + stages[-1:]].to_numpy(dtype="float64")
+    den = data[stages[:-1] + stages[:1]].to_numpy(dtype="float64")
+    rates = pd.DataFrame(num, index=data.index, columns=names) / den
+    return rates.where(den != 0, 0.0)
+
+
+def read_events(path, chunksize=5_000_000, user_col="User_ID", event_col="Event_Type", ts_col="Timestamp"):
+    yield from pd.read_csv(
+        path,
+        usecols=[user_col, event_col, ts_col],
+        dtype={event_col: "category"},
+        parse_dates=[ts_col],
+        chunksize=chunksize,
+    )
+
+
+def sessionize(events, gap="30min", stages=STAGES, user_col="User_ID", event_col="Event_Type",
+               ts_col="Timestamp", first_session_id=0):
+    """
+    Turn raw (user, event, timestamp) rows into one row per session.
+    A session ends when the user changes or the gap between consecutive events
+    exceeds `gap`. Stage flags follow funnel order: a stage only counts if its
+    event happens at or after the previous reached stage, and `<A>_to_<B>_Sec`
+    holds the seconds between those in-order events, so it is never negative.
+    """
+    stages = list(stages)
+    k = len(stages)
+    user_codes, users = pd.factorize(events[user_col])
+    t = pd.to_datetime(events[ts_col]).to_numpy()
+    stage_codes = pd.Categorical(events[event_col], categories=stages).codes
+
+    order = np.lexsort((t, user_codes))
+    user_codes, t, stage_codes = user_codes[order], t[order], stage_codes[order]
+
+    new = np.ones(len(t), dtype=bool)
+    new[1:] = (user_codes[1:] != user_codes[:-1]) | ((t[1:] - t[:-1]) > pd.Timedelta(gap).to_timedelta64())
+    sid = np.cumsum(new) - 1
+    n_sessions = int(new.sum())
+
+    # rows are time-ordered inside each session, so walking the stages in
+    # funnel order and keeping the first hit at or after the previous stage's
+    # time gives each stage's earliest in-order event
+    hit = stage_codes >= 0
+    h_sid, h_stage, h_t = sid[hit], stage_codes[hit], t[hit]
+    first = np.full((n_sessions, k), np.datetime64("NaT"), dtype=t.dtype)
+    for i in range(k):
+        s_sid, s_t = h_sid[h_stage == i], h_t[h_stage == i]
+        if i:
+            prev = first[s_sid, i - 1]
+            ok = ~np.isnat(prev) & (s_t >= prev)
+            s_sid, s_t = s_sid[ok], s_t[ok]
+        first_hit = ~pd.Series(s_sid).duplicated().to_numpy()
+        first[s_sid[first_hit], i] = s_t[first_hit]
+    reached = ~np.isnat(first)
+
+    start = pd.Series(t[new])
+    out = pd.DataFrame({
+        "Session_ID": np.arange(n_sessions) + first_session_id,
+        "User_ID": users.take(user_codes[new]),
+        "Timestamp": start,
+        "Weekday": np.array(WEEKDAY_ORDER)[start.dt.dayofweek.to_numpy()],
+        "Hour": start.dt.hour,
+    })
+    for i, s in enumerate(stages):
+        out[s] = reached[:, i].astype("int8")
+    labels = stage_labels(stages)
+    for i in range(k - 1):
+        delta = (first[:, i + 1] - first[:, i]) / np.timedelta64(1, "s")
+        out[f"{labels[i]}_to_{labels[i + 1]}_Sec"] = np.where(reached[:, i + 1], delta, np.nan)
+    return out
+
+
+def stream_sessionize(chunks, gap="30min", stages=STAGES, user_col="User_ID", event_col="Event_Type",
+                      ts_col="Timestamp"):
+    """
+    Sessionize an event stream chunk by chunk. Each user's events must be
+    contiguous in the stream (e.g. files partitioned and sorted by user); the
+    last user of every chunk is carried over so no session is split.
+    """
+    carry = None
+    next_id = 0
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        tail = (chunk[user_col] == chunk[user_col].iloc[-1]).to_numpy()
+        carry = chunk[tail]
+        body = chunk[~tail]
+        if len(body):
+            sessions = sessionize(body, gap, stages, user_col, event_col, ts_col, first_session_id=next_id)
+            next_id += len(sessions)
+            yield sessions
+    if carry is not None and len(carry):
+        yield sessionize(carry, gap, stages, user_col, event_col, ts_col, first_session_id=next_id)
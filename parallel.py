@@ -0,0 +1,24 @@
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+# Process-pool helper shared by the engines that split work into blocks
+# (forecast backtests, pricing bootstraps).
+
+
+def process_map(func, tasks, workers):
+    """
+    [func(t) for t in tasks], spread over `workers` processes when there is
+    more than one task. The scripts run at module level with no __main__
+    guard, so only fork (which does not re-import them) can start the
+    workers; elsewhere it warns and runs in a single process.
+    """
+    if workers > 1 and len(tasks) > 1:
+        if "fork" in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                return list(pool.map(func, tasks))
+        warnings.warn(
+            f"workers={workers} needs the 'fork' start method, which this platform lacks; "
+            "running in a single process", RuntimeWarning, stacklevel=3,
+        )
+    return [func(t) for t in tasks]
@@ -0,0 +1,442 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from parallel import process_map
+
+# Linear demand models for the pricing analyzer, fitted for every product
+# at once from grouped sums instead of a Python call per product.
+
+KEYS = ["Product_ID", "Category"]
+# P_opt is searched within [0.7 * lowest, 1.3 * highest] observed price
+CLAMP = (0.7, 1.3)
+STAT_COLUMNS = ["n", "Sp", "Sq", "Spp", "Sqq", "Spq", "P_Min", "P_Max", "Q_Mean"]
+FIT_COLUMNS = ["a", "b", "P_opt", "Rev_opt", "Corr_Price_Units"]
+INTERVAL_COLUMNS = [
+    "b_CI_Low", "b_CI_High", "Elasticity", "Elasticity_CI_Low", "Elasticity_CI_High", "P_opt_CI_Low", "P_opt_CI_High",
+]
+CROSS_COLUMNS = ["Product_ID", "Cross_Product_ID", "Own_Elasticity", "Cross_Elasticity", "T_Stat", "Weeks"]
+# bumped when bootstrap draws change, so cached CIs from older draws are refit
+BOOTSTRAP_SCHEME = 2
+# everything fit_demand_cached() keeps per product
+PRODUCT_CACHE_COLUMNS = STAT_COLUMNS + FIT_COLUMNS + INTERVAL_COLUMNS
+
+
+def demand_stats(df, keys=KEYS, price_col="Price", units_col="Units_Sold"):
+    """
+    Sufficient statistics per product: n and the sums of p, q, p², q², pq
+    (plus observed price bounds), from one grouped aggregation. Sums of
+    disjoint row sets add up, so batches of weeks can be combined.
+    """
+    p = df[price_col].astype("float64")
+    q = df[units_col].astype("float64")
+    parts = pd.DataFrame({"p": p, "q": q, "pp": p * p, "qq": q * q, "pq": p * q})
+    g = parts.groupby([df[k] for k in keys], sort=True)
+    stats = g.agg(
+        n=("p", "size"), Sp=("p", "sum"), Sq=("q", "sum"),
+        Spp=("pp", "sum"), Sqq=("qq", "sum"), Spq=("pq", "sum"),
+        P_Min=("p", "min"), P_Max=("p", "max"),
+    )
+    stats["Q_Mean"] = stats["Sq"] / stats["n"]
+    return stats
+
+
+def fit_demand(stats, clamp=CLAMP):
+    """
+    Least-squares q = a + b·p, revenue-maximising P_opt = -a / 2b clamped to
+    the observed range, Rev_opt and the price/units correlation, all as
+    columnar arithmetic on demand_stats() output. Products with a single
+    distinct price get no model (NA).
+    """
+    n = stats["n"].astype("float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var_p = (stats["Spp"] - stats["Sp"] ** 2 / n) / (n - 1)
+        var_q = (stats["Sqq"] - stats["Sq"] ** 2 / n) / (n - 1)
+        cov = (stats["Spq"] - stats["Sp"] * stats["Sq"] / n) / (n - 1)
+        # min == max is the exact zero-variance test (the sums only get close)
+        fitted = (n > 1) & (stats["P_Min"] < stats["P_Max"])
+        b = (cov / var_p).where(fitted)
+        a = (stats["Q_Mean"] - b * stats["Sp"] / n).where(fitted)
+        corr = (cov / np.sqrt(var_p * var_q)).where(fitted & (var_q > 0)).clip(-1, 1)
+
+        flat = fitted & (b == 0)
+        rev_lo = stats["P_Min"] * a
+        rev_hi = stats["P_Max"] * a
+        p_flat = stats["P_Min"].where(rev_lo >= rev_hi, stats["P_Max"])
+
+        p_opt = (-a / (2 * b)).clip(stats["P_Min"] * clamp[0], stats["P_Max"] * clamp[1])
+        rev_opt = p_opt * (a + b * p_opt).clip(lower=0)
+    out = pd.DataFrame({
+        "a": a,
+        "b": b,
+        "P_opt": p_opt.round(2).where(~flat, p_flat),
+        "Rev_opt": rev_opt.round(2).where(~flat, p_flat * a),
+        "Corr_Price_Units": corr,
+    })
+    return out.astype("float64")
+
+
+def revenue_curves(fit, stats, points=41, clamp=CLAMP, argmax_window=None):
+    """
+    Predicted units and revenue on a `points`-step price grid per product,
+    spanning [0.7·min, 1.3·max] observed price, built as one products x
+    points matrix. Products without a model predict their mean units.
+    With `argmax_window = k` only the k grid points either side of each
+    curve's revenue peak are returned.
+    """
+    lo = (stats["P_Min"] * clamp[0]).to_numpy()[:, None]
+    hi = (stats["P_Max"] * clamp[1]).to_numpy()[:, None]
+    steps = np.arange(points)[None, :]
+    price = np.round(lo + steps * (hi - lo) / max(points - 1, 1), 2)
+    a = fit["a"].to_numpy()[:, None]
+    b = fit["b"].to_numpy()[:, None]
+    units = np.where(np.isnan(a) | np.isnan(b), stats["Q_Mean"].to_numpy()[:, None], a + b * price)
+    units = np.maximum(units, 0.0)
+    revenue = np.round(price * units, 2)
+
+    keep = np.ones(price.shape, dtype=bool)
+    if argmax_window is not None:
+        peak = revenue.argmax(axis=1)[:, None]
+        keep = np.abs(steps - peak) <= argmax_window
+    rows, cols = np.nonzero(keep)
+    out = fit.index.to_frame(index=False).iloc[rows].reset_index(drop=True)
+    out["Price"] = price[rows, cols]
+    out["Pred_Units"] = units[rows, cols]
+    out["Pred_Revenue"] = revenue[rows, cols]
+    return out
+
+
+def strategy_label(pct_change):
+    return f"{pct_change * 100:g}%"
+
+
+def simulate_strategies(fit, stats, strategies, category_strategies=None):
+    """
+    Every product x price move (fraction of its average observed price) in
+    one joined frame. `category_strategies` maps a Category to its own list
+    of moves, replacing `strategies` for that category.
+    """
+    overrides = category_strategies or {}
+    products = fit[["a", "b"]].join(stats[["Sp", "n", "Q_Mean"]]).reset_index()
+    moves = pd.DataFrame(
+        [(c, pct, strategy_label(pct)) for c in products["Category"].unique() for pct in overrides.get(c, strategies)],
+        columns=["Category", "Pct_Change", "Strategy"],
+    )
+    frame = products.merge(moves, on="Category", how="inner", sort=False)
+    new_price = (frame["Sp"] / frame["n"] * (1 + frame["Pct_Change"])).round(2)
+    units = (frame["a"] + frame["b"] * new_price).clip(lower=0)
+    units = units.where(frame["a"].notna() & frame["b"].notna(), frame["Q_Mean"])
+    return pd.DataFrame({
+        "Product_ID": frame["Product_ID"],
+        "Category": frame["Category"],
+        "Strategy": frame["Strategy"],
+        "New_Price": new_price,
+        "Expected_Units": units.round(2),
+        "Expected_Revenue": (new_price * units).round(2),
+    })
+
+
+def best_strategies(strategy_df):
+    """Highest Expected_Revenue row per product (vectorized idxmax)."""
+    best = strategy_df.loc[strategy_df.groupby("Product_ID", sort=True)["Expected_Revenue"].idxmax()]
+    return best.rename(columns={"Strategy": "Best_Strategy"}).reset_index(drop=True)
+
+
+def weekly_matrix(df, keys=KEYS, price_col="Price", units_col="Units_Sold"):
+    """Products (demand_stats() order) x weeks matrices of price and units, NaN-padded."""
+    g = df.groupby(list(keys), sort=True)
+    row = g.ngroup().to_numpy()
+    col = g.cumcount().to_numpy()
+    shape = (int(row.max()) + 1, int(col.max()) + 1) if len(row) else (0, 0)
+    p = np.full(shape, np.nan)
+    q = np.full(shape, np.nan)
+    p[row, col] = df[price_col].to_numpy(dtype="float64")
+    q[row, col] = df[units_col].to_numpy(dtype="float64")
+    return p, q
+
+
+def _slopes(x, y, w):
+    # weighted least-squares slope of y on x along the last axis
+    n = w.sum(-1)
+    sx, sy = (w * x).sum(-1), (w * y).sum(-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (n * (w * x * y).sum(-1) - sx * sy) / (n * (w * x * x).sum(-1) - sx ** 2)
+        return slope, (sy - slope * sx) / n
+
+
+def _bootstrap_block(args):
+    p, q, lo, hi, reps, seed, product_seeds, level = args
+    n = (~np.isnan(p)).sum(axis=1)
+    width = p.shape[1]
+    # resample index matrix: reps draws of each product's n weeks, from a
+    # stream seeded by the product alone so batching never changes its draws
+    idx = np.zeros((len(p), reps, width), dtype="int64")
+    for i, (product_seed, weeks) in enumerate(zip(product_seeds, n)):
+        if weeks:
+            idx[i, :, :weeks] = np.random.default_rng([seed, int(product_seed)]).integers(0, weeks, (reps, weeks))
+    rows = np.arange(len(p))[:, None, None]
+    inside = np.arange(width)[None, None, :] < n[:, None, None]
+    pr = np.where(inside, p[rows, idx], 1.0)
+    qr = np.where(inside, q[rows, idx], 0.0)
+
+    b, a = _slopes(pr, qr, inside.astype("float64"))
+    positive = inside & (qr > 0)
+    elasticity, _ = _slopes(np.log(pr), np.log(np.where(positive, qr, 1.0)), positive.astype("float64"))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p_opt = np.clip(-a / (2 * b), lo[:, None], hi[:, None])
+    p_opt = np.where(np.isfinite(b) & (b != 0), p_opt, np.nan)
+
+    tail = (1 - level) / 2 * 100
+    out = {}
+    for name, values in (("b", b), ("Elasticity", elasticity), ("P_opt", p_opt)):
+        values = np.where(np.isfinite(values), values, np.nan)
+        with np.errstate(invalid="ignore"):
+            ci = np.nanpercentile(values, [tail, 100 - tail], axis=1) if values.size else np.empty((2, 0))
+        out[f"{name}_CI_Low"], out[f"{name}_CI_High"] = ci
+    return pd.DataFrame(out)
+
+
+def bootstrap_intervals(df, stats, reps=2000, level=0.95, seed=42, workers=1, batch_size=200,
+                        clamp=CLAMP, keys=KEYS, price_col="Price", units_col="Units_Sold"):
+    """
+    Percentile bootstrap intervals for the demand slope b, the log-log
+    price elasticity and P_opt. Each product's weekly rows are resampled
+    `reps` times through an index matrix, and each resample's regression
+    comes from vectorized sums over it. Every product draws from its own
+    random stream, seeded by `seed` and a hash of its keys, so its intervals
+    depend only on its own rows, never on `batch_size`, the worker count or
+    which other products are passed in. Product batches go to `workers`
+    processes (fork platforms; elsewhere it warns and runs in-process).
+    The point log-log Elasticity is included alongside.
+    """
+    p, q = weekly_matrix(df, keys, price_col, units_col)
+    lo = (stats["P_Min"] * clamp[0]).to_numpy()
+    hi = (stats["P_Max"] * clamp[1]).to_numpy()
+    product_seeds = pd.util.hash_pandas_object(stats.index.to_frame(index=False), index=False).to_numpy()
+    tasks = [
+        (p[i:i + batch_size], q[i:i + batch_size], lo[i:i + batch_size], hi[i:i + batch_size],
+         reps, seed, product_seeds[i:i + batch_size], level)
+        for i in range(0, len(p), batch_size)
+    ]
+    parts = process_map(_bootstrap_block, tasks, workers)
+    out = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    out.index = stats.index
+
+    valid = ~np.isnan(p)
+    positive = valid & (np.nan_to_num(q) > 0)
+    elasticity, _ = _slopes(np.log(np.where(valid, p, 1.0)), np.log(np.where(positive, q, 1.0)), positive.astype("float64"))
+    out.insert(2, "Elasticity", elasticity)
+    return out
+
+
+def _log_centered(wide):
+    # log values centered per product; missing (or non-positive) weeks are
+    # imputed at the product mean, i.e. contribute 0 to the centered sums
+    with np.errstate(invalid="ignore", divide="ignore"):
+        logs = np.log(wide.where(wide > 0)).to_numpy()
+    seen = ~np.isnan(logs)
+    return np.where(seen, logs - np.nanmean(np.where(seen, logs, np.nan), axis=0), 0.0), seen.astype("float64")
+
+
+def cross_elasticities(df, min_t=2.0, block_size=512, week_col="Week", price_col="Price",
+                       units_col="Units_Sold", id_col="Product_ID", category_col="Category"):
+    """
+    Own / cross price elasticities within each category. Prices and units
+    are pivoted to Week x Product matrices; for every target i and rival j
+    log q_i = c + e_own·log p_i + e_cross·log p_j is solved from cross-product
+    matrices (X'X, X'Y), built for blocks of `block_size` targets at a time
+    so memory stays at products x block. Own rows (j = i) are the simple
+    log-log fit. Returns the long table of pairs with |t| >= min_t.
+    """
+    frames = []
+    for category, rows in df.groupby(category_col, sort=True):
+        x, x_seen = _log_centered(rows.pivot_table(index=week_col, columns=id_col, values=price_col, aggfunc="mean"))
+        ids = rows[id_col].drop_duplicates().sort_values().to_numpy()
+        y, y_seen = _log_centered(rows.pivot_table(index=week_col, columns=id_col, values=units_col, aggfunc="mean")
+                                      .reindex(columns=ids))
+        sxx = x.T @ x
+        own = np.diag(sxx)
+        for start in range(0, len(ids), block_size):
+            block = slice(start, start + block_size)
+            yb = y[:, block]
+            sxy = x.T @ yb                      # [j, i] = sum x_j y_i
+            syy = (yb ** 2).sum(axis=0)
+            weeks = x_seen.T @ y_seen[:, block]
+            sii = own[block][None, :]
+            sxiy = np.diag(sxy[block])[None, :]
+            sij = sxx[:, block]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                det = sii * own[:, None] - sij ** 2
+                e_cross = (sii * sxy - sij * sxiy) / det
+                e_own = (own[:, None] * sxiy - sij * sxy) / det
+                rss = syy[None, :] - e_own * sxiy - e_cross * sxy
+                t = e_cross / np.sqrt(rss / (weeks - 3) * sii / det)
+                # j == i: single-regressor own elasticity
+                diag = np.arange(yb.shape[1])
+                simple = sxiy[0] / sii[0]
+                e_own[start + diag, diag] = simple
+                e_cross[start + diag, diag] = simple
+                t[start + diag, diag] = simple / np.sqrt((syy - simple * sxiy[0]) / (np.diag(weeks[block]) - 2) / sii[0])
+            j, i = np.nonzero(np.abs(np.nan_to_num(t)) >= min_t)
+            frames.append(pd.DataFrame({
+                category_col: category,
+                id_col: ids[block][i],
+                "Cross_Product_ID": ids[j],
+                "Own_Elasticity": e_own[j, i],
+                "Cross_Elasticity": e_cross[j, i],
+                "T_Stat": t[j, i],
+                "Weeks": weeks[j, i].astype("int64"),
+            }))
+    columns = [category_col, id_col, "Cross_Product_ID", "Own_Elasticity", "Cross_Elasticity", "T_Stat", "Weeks"]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).sort_values([category_col, id_col, "Cross_Product_ID"], ignore_index=True)
+
+
+def product_groups(df, keys=KEYS):
+    """Group code of every row and the sorted product index (demand_stats() order)."""
+    g = df.groupby(list(keys), sort=True)
+    return g.ngroup().to_numpy(), g.size().index
+
+
+def fingerprints(df, keys=KEYS, columns=("Week", "Price", "Units_Sold"), groups=None):
+    """
+    Content hash per product: the wrapping uint64 sum of its row hashes, so
+    any added, removed or edited week changes it while row order does not.
+    `groups` reuses product_groups() output instead of grouping again.
+    """
+    codes, index = groups if groups is not None else product_groups(df, keys)
+    rows = pd.util.hash_pandas_object(df[list(columns)], index=False)
+    total = rows.groupby(codes).sum()
+    return pd.Series(total.to_numpy(), index=index).map("{:016x}".format).rename("Fingerprint")
+
+
+def category_fingerprints(prints, category_col="Category"):
+    """Content hash per category: the wrapping sum of its products' fingerprints."""
+    totals = prints.map(lambda h: int(h, 16)).groupby(level=category_col).sum()
+    return totals.map(lambda v: f"{v % 2 ** 64:016x}").rename("Fingerprint")
+
+
+class ModelCache:
+    """
+    Result rows pickled at `path`, keyed by the fingerprint of the data
+    they were computed from. A key may own several rows (e.g. a category's
+    cross-price pairs); a key whose result is empty keeps one all-NA row so
+    it still counts as computed. Rows unused for `max_age_days` are evicted
+    first, then the least recently used keys beyond `max_entries`. A cache
+    file without all of `columns` (older layout) is ignored.
+    """
+
+    def __init__(self, path, columns=None, max_entries=None, max_age_days=None, keys=KEYS):
+        self.path = path
+        self.columns = list(PRODUCT_CACHE_COLUMNS if columns is None else columns)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.keys = list(keys)
+        self.hits = 0
+        self.misses = 0
+        self.now = pd.Timestamp.now().floor("s")
+        layout = ["Fingerprint"] + self.columns + ["Last_Used"]
+        table = pd.read_pickle(path) if os.path.exists(path) else None
+        if table is None or list(table.index.names) != self.keys or not set(layout) <= set(table.columns):
+            index = pd.MultiIndex.from_tuples([], names=self.keys) if len(self.keys) > 1 else pd.Index([], name=self.keys[0])
+            table = pd.DataFrame(columns=layout, index=index)
+        self.table = table[layout]
+
+    def split(self, prints):
+        """Cached rows of the keys whose fingerprint still matches, and the keys to recompute."""
+        known = self.table["Fingerprint"]
+        known = known[~known.index.duplicated()].reindex(prints.index)
+        hit = known.eq(prints).to_numpy()
+        self.hits += int(hit.sum())
+        self.misses += int((~hit).sum())
+        used = self.table.index.isin(prints.index[hit])
+        self.table.loc[used, "Last_Used"] = self.now
+        cached = self.table.loc[used, self.columns].dropna(how="all")
+        return cached, prints.index[~hit]
+
+    def store(self, rows, prints, computed):
+        """Replace the rows of the `computed` keys with `rows` (indexed by key)."""
+        empty = computed[~computed.isin(rows.index)]
+        if len(empty):
+            placeholder = pd.DataFrame(np.nan, index=empty, columns=self.columns)
+            rows = pd.concat([rows, placeholder]) if len(rows) else placeholder
+        rows = rows[self.columns].assign(Fingerprint=prints.reindex(rows.index).to_numpy(), Last_Used=self.now)
+        rows = rows[self.table.columns]
+        kept = self.table[~self.table.index.isin(computed)]
+        # concat onto an empty table is deprecated (and needless)
+        self.table = pd.concat([kept, rows]) if len(kept) else rows
+
+    def evict(self):
+        used = pd.to_datetime(self.table["Last_Used"])
+        if self.max_age_days is not None:
+            self.table = self.table[(used >= self.now - pd.Timedelta(days=self.max_age_days)).to_numpy()]
+        if self.max_entries is not None:
+            last = pd.to_datetime(self.table["Last_Used"]).groupby(level=self.keys).max()
+            if len(last) > self.max_entries:
+                newest = last.sort_values(ascending=False, kind="stable").index[:self.max_entries]
+                self.table = self.table[self.table.index.isin(newest)]
+        return self
+
+    def save(self):
+        # pickled rather than CSV: the whole table is rewritten on every run
+        self.table.to_pickle(self.path + ".tmp")
+        os.replace(self.path + ".tmp", self.path)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def fit_demand_cached(df, cache, reps=2000, level=0.95, seed=42, workers=1, clamp=CLAMP, keys=KEYS,
+                      price_col="Price", units_col="Units_Sold"):
+    """
+    demand_stats(), fit_demand() and bootstrap_intervals() for the products
+    whose weekly rows changed since they were cached; unchanged products
+    reuse their cached rows, so only the fingerprint pass touches every row.
+    The bootstrap settings are part of the cache key, and every product's
+    CIs come from its own random stream, so a partly cached run matches a
+    cold one exactly. Updates, evicts and
+    saves the cache; returns (stats, fit, intervals, fingerprints) for every
+    product in demand_stats() order.
+    """
+    codes, index = groups = product_groups(df, keys)
+    prints = fingerprints(df, keys, groups=groups)
+    keyed = prints + f"/{BOOTSTRAP_SCHEME}:{reps}:{level}:{seed}:{clamp[0]}:{clamp[1]}"
+    cached, stale = cache.split(keyed)
+    parts = [cached]
+    if len(stale):
+        rows = df[np.isin(codes, index.get_indexer(stale))]
+        stats = demand_stats(rows, keys, price_col, units_col)
+        intervals = bootstrap_intervals(rows, stats, reps, level, seed, workers, clamp=clamp, keys=keys,
+                                        price_col=price_col, units_col=units_col)
+        fresh = stats.join(fit_demand(stats, clamp)).join(intervals)
+        cache.store(fresh, keyed, stale)
+        parts.append(fresh[cache.columns])
+    cache.evict().save()
+    out = (pd.concat(parts) if len(cached) else parts[-1]).reindex(index)
+    stats = out[STAT_COLUMNS].astype({"n": "int64"})
+    return stats, out[FIT_COLUMNS].astype("float64"), out[INTERVAL_COLUMNS].astype("float64"), prints
+
+
+def cross_elasticities_cached(df, prints, cache, min_t=2.0, category_col="Category", **params):
+    """
+    cross_elasticities() for the categories whose products changed (by
+    category_fingerprints() of `prints`); the other categories reuse their
+    cached pairs. Updates, evicts and saves the cache.
+    """
+    keyed = category_fingerprints(prints, category_col) + f"/{min_t}"
+    cached, stale = cache.split(keyed)
+    parts = [cached.reset_index()]
+    if len(stale):
+        fresh = cross_elasticities(df[df[category_col].isin(stale)], min_t, category_col=category_col, **params)
+        cache.store(fresh.set_index(category_col), keyed, stale)
+        parts.append(fresh)
+    cache.evict().save()
+    columns = [category_col] + CROSS_COLUMNS
+    parts = [p[columns] for p in parts if len(p)]
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    out = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    return out.astype({"Weeks": "int64"}).sort_values([category_col, "Product_ID", "Cross_Product_ID"], ignore_index=True)
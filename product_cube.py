@@ -0,0 +1,127 @@
+import os
+from collections import OrderedDict
+
+import pandas as pd
+
+# Materialized Region x Month x Category x Product_ID aggregate for the
+# product report: every roll-up / drill-down is answered from the cube cells
+# instead of the monthly rows.
+
+CUBE_DIMS = ["Region", "Month", "Category", "Product_ID"]
+# cube measure -> source column
+MEASURES = {"Revenue": "Revenue", "Cost": "Cost", "Profit": "Profit", "Units": "Units_Sold"}
+
+
+class ProductCube:
+    """
+    Cell sums per (Region, Month, Category, Product_ID). query() groups the
+    cells to any subset of the dimensions, optionally filtered, and keeps the
+    `cache_size` most recently used answers (LRU). refresh() folds in rows
+    for new or restated months and only drops cached slices those months
+    can affect.
+    """
+
+    def __init__(self, cells=None, cache_size=32):
+        self.cells = cells if cells is not None else pd.DataFrame(columns=CUBE_DIMS + list(MEASURES))
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_rows(cls, df, cache_size=32):
+        return cls(cache_size=cache_size).refresh(df)
+
+    @staticmethod
+    def _aggregate(df):
+        return (df.groupby(CUBE_DIMS, as_index=False, sort=False)[list(MEASURES.values())].sum()
+                  .rename(columns={v: k for k, v in MEASURES.items()}))
+
+    def refresh(self, df):
+        """Replace the cells of every month present in `df` with its sums."""
+        months = set(df["Month"].unique())
+        new = self._aggregate(df)
+        kept = self.cells[~self.cells["Month"].isin(months)]
+        self.cells = pd.concat([kept, new], ignore_index=True) if len(kept) else new
+        for key in list(self._cache):
+            pinned = dict(key[1]).get("Month")
+            if pinned is None or months & set(pinned):
+                del self._cache[key]
+        return self
+
+    def query(self, by=(), **filters):
+        """
+        Sums of every measure grouped by `by` (any subset of CUBE_DIMS, in
+        sorted order), after filtering dims to a value or list of values.
+        """
+        filters = {k: tuple(sorted(v)) if isinstance(v, (list, tuple, set)) else (v,) for k, v in filters.items()}
+        key = (tuple(by), tuple(sorted(filters.items())))
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key].copy()
+        self.misses += 1
+        cells = self.cells
+        for col, values in filters.items():
+            cells = cells[cells[col].isin(values)]
+        if by:
+            out = cells.groupby(list(by), as_index=False)[list(MEASURES)].sum()
+        else:
+            out = cells[list(MEASURES)].sum().to_frame().T.astype(cells[list(MEASURES)].dtypes)
+        self._cache[key] = out
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return out.copy()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def save(self, path):
+        self.cells.to_csv(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path, cache_size=32):
+        return cls(pd.read_csv(path, dtype={"Month": "str"}), cache_size=cache_size)
+
+
+def _with_measures(df):
+    if "Profit" not in df.columns:
+        df = df.assign(Revenue=df["Unit_Price"] * df["Units_Sold"], Cost=df["Unit_Cost"] * df["Units_Sold"])
+        df["Profit"] = df["Revenue"] - df["Cost"]
+    return df
+
+
+def partial_totals(df, keys=("Product_ID", "Category")):
+    """Measure sums per product for one partition (e.g. one monthly file)."""
+    return (_with_measures(df).groupby(list(keys), sort=False)[list(MEASURES.values())].sum()
+                              .rename(columns={v: k for k, v in MEASURES.items()}))
+
+
+def stream_product_totals(partitions, keys=("Product_ID", "Category")):
+    """
+    Per-product sums over partitions (DataFrames or CSV paths), merged one
+    partition at a time so only one partition plus the running totals are
+    ever in memory. Groups keep first-seen order: the product list is never
+    sorted, only hashed.
+    """
+    totals = None
+    for part in partitions:
+        if isinstance(part, (str, os.PathLike)):
+            part = pd.read_csv(part)
+        partial = partial_totals(part, keys)
+        totals = partial if totals is None else pd.concat([totals, partial]).groupby(level=list(keys), sort=False).sum()
+    if totals is None:
+        return pd.DataFrame(columns=list(keys) + list(MEASURES))
+    return totals.astype({"Units": "int64"}).reset_index()
+
+
+def rank_products(totals, k=5, metric="Profit", largest=True):
+    """
+    Top (or bottom) `k` products by `metric` (any measure, or ROI_% =
+    Profit / Cost) with nlargest / nsmallest: O(n log k), no full sort.
+    """
+    if metric == "ROI_%":
+        totals = totals.assign(**{"ROI_%": (totals["Profit"] / totals["Cost"]).replace([float("inf")], 0) * 100})
+    return totals.nlargest(k, metric) if largest else totals.nsmallest(k, metric)
@@ -0,0 +1,394 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from funnel_engine import file_batch_id
+from streaming_stats import QuantileSketch
+
+# RFM building blocks for order logs far larger than RAM.
+# Per-customer accumulators live in flat numpy arrays addressed by a
+# factorized customer code, so memory scales with customers, not order lines.
+
+# score labels per column, lowest quartile first (recent buyers score high)
+RFM_LABELS = {"Recency": [4, 3, 2, 1], "Frequency": [1, 2, 3, 4], "Monetary": [1, 2, 3, 4]}
+SCORE_COLUMNS = {"Recency": "R_Score", "Frequency": "F_Score", "Monetary": "M_Score"}
+
+
+def read_transactions(path, chunksize=5_000_000, customer_col="Customer_ID", date_col="Order_Date",
+                      amount_col="Amount"):
+    yield from pd.read_csv(
+        path,
+        usecols=[customer_col, date_col, amount_col],
+        dtype={amount_col: "float64"},
+        parse_dates=[date_col],
+        chunksize=chunksize,
+    )
+
+
+class RFMAccumulator:
+    """
+    Streaming groupby for Recency/Frequency/Monetary: keeps last order day,
+    order-line count and amount sum per customer. Feed it chunks of order lines
+    with update(), combine partitions with merge(), then call frame().
+    """
+
+    def __init__(self, customer_col="Customer_ID", date_col="Order_Date", amount_col="Amount"):
+        self.customer_col = customer_col
+        self.date_col = date_col
+        self.amount_col = amount_col
+        self.customers = pd.Index([])
+        self.last_day = np.empty(0, dtype="int64")
+        self.count = np.empty(0, dtype="int64")
+        self.total = np.empty(0, dtype="float64")
+
+    def __len__(self):
+        return len(self.customers)
+
+    def _codes(self, ids):
+        codes = self.customers.get_indexer(ids)
+        missing = codes < 0
+        if missing.any():
+            new = pd.Index(pd.unique(ids[missing]))
+            self.customers = self.customers.append(new)
+            self._grow(len(self.customers))
+            codes[missing] = self.customers.get_indexer(ids[missing])
+        return codes
+
+    def _grow(self, size):
+        if size <= len(self.last_day):
+            return
+        capacity = max(size, 2 * len(self.last_day))
+        self.last_day = np.concatenate([self.last_day, np.full(capacity - len(self.last_day), np.iinfo("int64").min)])
+        self.count = np.concatenate([self.count, np.zeros(capacity - len(self.count), dtype="int64")])
+        self.total = np.concatenate([self.total, np.zeros(capacity - len(self.total))])
+
+    def _fold(self, codes, last_day, count, total):
+        self.last_day[codes] = np.maximum(self.last_day[codes], last_day)
+        self.count[codes] += count
+        self.total[codes] += total
+
+    def update(self, orders):
+        ids = orders[self.customer_col].to_numpy()
+        days = pd.to_datetime(orders[self.date_col]).to_numpy().astype("datetime64[D]").astype("int64")
+        part = (
+            pd.DataFrame({"code": self._codes(ids), "day": days, "amount": orders[self.amount_col].to_numpy()})
+              .groupby("code")
+              .agg(day=("day", "max"), count=("day", "size"), amount=("amount", "sum"))
+        )
+        self._fold(part.index.to_numpy(), part["day"].to_numpy(), part["count"].to_numpy(), part["amount"].to_numpy())
+        return self
+
+    def merge(self, other):
+        n = len(other)
+        if n:
+            codes = self._codes(other.customers.to_numpy())
+            self._fold(codes, other.last_day[:n], other.count[:n], other.total[:n])
+        return self
+
+    def frame(self, as_of=None):
+        """
+        One row per customer in the script's Customer_ID/Recency/Frequency/
+        Monetary layout. Recency is days before `as_of`, which defaults to the
+        day after the latest order (so the most recent buyer has Recency 1).
+        """
+        n = len(self)
+        last = self.last_day[:n]
+        if as_of is None:
+            as_of_day = int(last.max()) + 1 if n else 0
+        else:
+            as_of_day = int(np.datetime64(pd.Timestamp(as_of).date(), "D").astype("int64"))
+        return pd.DataFrame({
+            "Customer_ID": self.customers,
+            "Recency": as_of_day - last,
+            "Frequency": self.count[:n],
+            "Monetary": self.total[:n].round(2),
+        })
+
+
+def qcut_scores(values, labels):
+    """
+    pd.qcut into len(labels) bins. Heavily tied columns (e.g. the many
+    one-order customers of a real log) are ranked first so bin edges stay unique.
+    """
+    try:
+        return pd.qcut(values, len(labels), labels=labels).astype(int)
+    except ValueError:
+        return pd.qcut(values.rank(method="first"), len(labels), labels=labels).astype(int)
+
+
+def rfm_sketches(df, relative_accuracy=0.01):
+    """Per-partition QuantileSketch of Recency, Frequency and Monetary."""
+    return {c: QuantileSketch(relative_accuracy).update(df[c]) for c in RFM_LABELS}
+
+
+def merge_rfm_sketches(parts):
+    parts = list(parts)
+    merged = {c: QuantileSketch(s.relative_accuracy) for c, s in parts[0].items()}
+    for part in parts:
+        for c, sketch in part.items():
+            merged[c].merge(sketch)
+    return merged
+
+
+def quartile_edges(sketches, n_bins=4):
+    """
+    Inner bin edges per column from merged sketches. Each edge is within the
+    sketches' relative_accuracy of the exact quantile, so only customers whose
+    value lies that close to an edge can land one score away from pd.qcut.
+    """
+    qs = [i / n_bins for i in range(1, n_bins)]
+    return {c: sketch.quantile(qs) for c, sketch in sketches.items()}
+
+
+def bin_scores(values, edges, labels):
+    """Vectorized (lo, hi] binning against precomputed edges, like pd.qcut."""
+    idx = np.searchsorted(edges, values.to_numpy(dtype="float64"), side="left")
+    return pd.Series(np.asarray(labels)[idx], index=values.index)
+
+
+def _score_column(values, edges, column):
+    if pd.api.types.is_integer_dtype(values):
+        edges = np.round(edges)
+    return bin_scores(values, edges, RFM_LABELS[column])
+
+
+def approx_scores(df, edges):
+    """
+    R/F/M scores from sketch edges. Edges of integer columns (Recency,
+    Frequency) are snapped to whole numbers, which recovers the exact
+    quantile whenever the relative error is under half a unit.
+    """
+    out = pd.DataFrame(index=df.index)
+    for c in RFM_LABELS:
+        out[SCORE_COLUMNS[c]] = _score_column(df[c], edges[c], c)
+    return out
+
+
+# Segment rule tables: first matching rule wins. Conditions are inclusive
+# (lo, hi) ranges on "R", "F", "M" scores and/or the summed "RFM_Score";
+# a rule without conditions is the catch-all.
+GOLD_SILVER_BRONZE = [
+    {"Segment": "Gold", "RFM_Score": (10, 12)},
+    {"Segment": "Silver", "RFM_Score": (7, 9)},
+    {"Segment": "Bronze"},
+]
+
+CLASSIC_SEGMENTS = [
+    {"Segment": "Champions", "R": (4, 4), "F": (4, 4), "M": (3, 4)},
+    {"Segment": "Loyal", "R": (3, 4), "F": (3, 4)},
+    {"Segment": "Big Spenders", "M": (4, 4), "R": (2, 4)},
+    {"Segment": "Potential Loyalists", "R": (4, 4), "F": (1, 2)},
+    {"Segment": "Can't Lose Them", "R": (1, 1), "F": (4, 4)},
+    {"Segment": "At Risk", "R": (1, 2), "F": (3, 4)},
+    {"Segment": "Hibernating", "R": (1, 1), "F": (1, 2)},
+    # mid recency (R 2-3) with low frequency (F 1-2)
+    {"Segment": "Needs Attention"},
+]
+
+
+class SegmentRules:
+    """
+    Compiles a rule table into an n_bins**3 cube mapping every (R, F, M)
+    score combination to a segment code, so labeling is one fancy-indexing
+    lookup per customer. Calling the object on a frame with R_Score/F_Score/
+    M_Score returns a categorical Segment Series (usable as a rescore labeler).
+    """
+
+    def __init__(self, rules, n_bins=4, default="Unclassified"):
+        r, f, m = np.indices((n_bins, n_bins, n_bins)) + 1
+        values = {"R": r, "F": f, "M": m, "RFM_Score": r + f + m}
+        labels = list(dict.fromkeys(rule["Segment"] for rule in rules))
+        cube = np.full(r.shape, -1, dtype="int16")
+        for rule in rules:
+            match = cube == -1
+            for key, bounds in rule.items():
+                if key == "Segment":
+                    continue
+                if key not in values:
+                    raise ValueError(f"Unknown rule condition {key!r}; use R, F, M or RFM_Score")
+                lo, hi = bounds
+                match &= (values[key] >= lo) & (values[key] <= hi)
+            cube[match] = labels.index(rule["Segment"])
+        if (cube == -1).any():
+            labels.append(default)
+            cube[cube == -1] = len(labels) - 1
+        self.n_bins = n_bins
+        self.labels = labels
+        self.cube = cube
+
+    def __call__(self, scores):
+        codes = self.cube[
+            scores["R_Score"].to_numpy() - 1,
+            scores["F_Score"].to_numpy() - 1,
+            scores["M_Score"].to_numpy() - 1,
+        ]
+        return pd.Series(pd.Categorical.from_codes(codes, categories=self.labels), index=scores.index)
+
+
+def stream_rfm(source, chunksize=5_000_000, **columns):
+    """Fold a transaction CSV path or an iterable of order-line chunks."""
+    acc = RFMAccumulator(**columns)
+    if isinstance(source, (str, os.PathLike)):
+        source = read_transactions(source, chunksize=chunksize, **columns)
+    for chunk in source:
+        acc.update(chunk)
+    return acc
+
+
+STATE_COLUMNS = [
+    "Customer_ID", "Last_Order_Date", "Recency", "Frequency", "Monetary",
+    "R_Score", "F_Score", "M_Score", "RFM_Score", "Segment",
+]
+
+
+def _edge_drift(old, new):
+    return max(
+        float(np.max(np.abs(new[c] - np.asarray(old[c])) / np.maximum(np.abs(np.asarray(old[c])), 1e-9)))
+        for c in RFM_LABELS
+    )
+
+
+def rescore(state, delta, labeler, edges=None, as_of=None, tolerance=0.02, relative_accuracy=0.01):
+    """
+    Fold a day's RFMAccumulator `delta` into a scored `state` frame.
+    Recency ages for everyone with one vectorized subtraction and R is
+    re-binned against the kept edges; F/M are re-binned only for customers
+    who ordered. All scores are re-binned (and the edges replaced) only when
+    the freshly sketched quartile edges drift more than `tolerance` (relative)
+    from the kept ones. `labeler(frame) -> Series` runs only on rows whose
+    scores moved. `as_of` defaults to the run date, so Recency keeps ageing
+    on days without orders. Returns (state, edges, changes, rebinned).
+    """
+    n_old = 0 if state is None else len(state)
+    n_delta = len(delta)
+    ids = pd.Index([]) if state is None else pd.Index(state["Customer_ID"])
+    pos = ids.get_indexer(delta.customers[:n_delta])
+    seen = pos >= 0
+
+    if state is None:
+        last = np.empty(0, dtype="int64")
+        freq = np.empty(0, dtype="int64")
+        mon = np.empty(0, dtype="float64")
+        old_scores = np.zeros((0, 3), dtype="int64")
+        segment = np.empty(0, dtype=object)
+    else:
+        last = state["Last_Order_Date"].to_numpy().astype("datetime64[D]").astype("int64")
+        freq = state["Frequency"].to_numpy(dtype="int64").copy()
+        mon = state["Monetary"].to_numpy(dtype="float64").copy()
+        old_scores = state[["R_Score", "F_Score", "M_Score"]].to_numpy(dtype="int64")
+        segment = state["Segment"].to_numpy(dtype=object).copy()
+
+    d_last, d_count, d_total = delta.last_day[:n_delta], delta.count[:n_delta], delta.total[:n_delta]
+    hit = pos[seen]
+    last[hit] = np.maximum(last[hit], d_last[seen])
+    freq[hit] += d_count[seen]
+    mon[hit] += d_total[seen]
+
+    new = ~seen
+    customers = ids.append(pd.Index(delta.customers[:n_delta][new]))
+    last = np.concatenate([last, d_last[new]])
+    freq = np.concatenate([freq, d_count[new]])
+    mon = np.concatenate([mon, d_total[new]])
+    old_scores = np.concatenate([old_scores, np.zeros((int(new.sum()), 3), dtype="int64")])
+    segment = np.concatenate([segment, np.full(int(new.sum()), None, dtype=object)])
+    touched = np.zeros(len(customers), dtype=bool)
+    touched[hit] = True
+    touched[n_old:] = True
+
+    as_of = pd.Timestamp.today() if as_of is None else pd.Timestamp(as_of)
+    as_of_day = int(np.datetime64(as_of.date(), "D").astype("int64"))
+    current = pd.DataFrame({"Recency": as_of_day - last, "Frequency": freq, "Monetary": mon.round(2)})
+
+    fresh = quartile_edges(rfm_sketches(current, relative_accuracy))
+    rebinned = edges is None or _edge_drift(edges, fresh) > tolerance
+    if rebinned:
+        edges = fresh
+
+    scores = old_scores.copy()
+    scores[:, 0] = _score_column(current["Recency"], edges["Recency"], "Recency").to_numpy()
+    rows = slice(None) if rebinned else touched
+    for i, c in ((1, "Frequency"), (2, "Monetary")):
+        scores[rows, i] = _score_column(current.loc[rows, c], edges[c], c).to_numpy()
+
+    out = current.copy()
+    out.insert(0, "Customer_ID", customers)
+    out.insert(1, "Last_Order_Date", pd.to_datetime(last, unit="D"))
+    out["R_Score"], out["F_Score"], out["M_Score"] = scores[:, 0], scores[:, 1], scores[:, 2]
+    out["RFM_Score"] = scores.sum(axis=1)
+
+    moved = touched | (scores != old_scores).any(axis=1)
+    if moved.any():
+        segment[moved] = labeler(out.loc[moved]).to_numpy()
+    out["Segment"] = segment
+    changes = out[moved]
+    return out[STATE_COLUMNS], edges, changes[STATE_COLUMNS], rebinned
+
+
+def _read_state(state_path):
+    if not os.path.exists(state_path):
+        return None, None, []
+    with open(state_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    data_path = os.path.join(os.path.dirname(state_path), manifest["data"])
+    state = pd.read_csv(data_path, parse_dates=["Last_Order_Date"])
+    edges = {c: np.asarray(v) for c, v in manifest["edges"].items()}
+    return state, edges, manifest["batches"]
+
+
+def load_state(state_path):
+    return _read_state(state_path)[:2]
+
+
+def save_state(state, edges, state_path, batches=()):
+    """
+    The per-customer table goes to a new generation file next to
+    `state_path`; `state_path` itself is a small JSON manifest naming that
+    file plus the quartile edges and the ledger of folded batch ids. The
+    manifest is swapped in with a single os.replace, so a crash leaves either
+    the old state or the new one, never a table without its edges or ledger.
+    """
+    generation = 0
+    if os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as f:
+            previous = json.load(f)["data"]
+        generation = int(previous.rsplit(".", 2)[-2]) + 1
+    stem = os.path.splitext(state_path)[0]
+    data_path = f"{stem}.{generation}.csv"
+    state.to_csv(data_path, index=False)
+    manifest = {
+        "data": os.path.basename(data_path),
+        "edges": {c: [float(x) for x in e] for c, e in edges.items()},
+        "batches": list(batches),
+    }
+    with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(state_path + ".tmp", state_path)
+    old = f"{stem}.{generation - 1}.csv"
+    if generation and os.path.exists(old):
+        os.remove(old)
+
+
+def update_state(state_path, orders, labeler, batch_id=None, as_of=None, tolerance=0.02, chunksize=5_000_000,
+                 **columns):
+    """
+    Daily job: fold `orders` (CSV path or chunks of new order lines) into the
+    state persisted at `state_path`, rescore incrementally and save.
+    The first run (no state yet) scores everyone. A batch_id that was
+    already folded in is skipped (returns the saved state, no changes), so
+    re-running the job on the same day's orders does not double count; the
+    id is recorded in the same write as the state it produced. batch_id
+    defaults to a hash of the orders file's content.
+    """
+    if batch_id is None:
+        if not isinstance(orders, (str, os.PathLike)):
+            raise ValueError("update_state needs a batch_id when orders are not a CSV path")
+        batch_id = file_batch_id(orders)
+    state, edges, batches = _read_state(state_path)
+    if str(batch_id) in batches:
+        return state, state.iloc[:0], False
+    delta = stream_rfm(orders, chunksize=chunksize, **columns)
+    state, edges, changes, rebinned = rescore(state, delta, labeler, edges, as_of, tolerance)
+    save_state(state, edges, state_path, batches + [str(batch_id)])
+    return state, changes, rebinned
@@ -0,0 +1,198 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Mergeable summaries for data that arrives in chunks, files or worker
+# processes: each one is updated per chunk and combined with merge().
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch (DDSketch style).
+    A value v > 0 lands in bucket ceil(log_gamma(v)), so every quantile it
+    returns is within `relative_accuracy` of the true value (e.g. 0.01 -> 1%),
+    independent of how many values were added. Memory grows with the log of
+    the value range, not with the row count. Sketches with the same accuracy
+    merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = pd.Series(dtype="int64")
+        self.negative = pd.Series(dtype="int64")
+        self.zeros = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _buckets(self, values):
+        keys = np.ceil(np.log(values) / self._log_gamma).astype("int64")
+        return pd.Series(keys).value_counts()
+
+    def update(self, values):
+        v = pd.to_numeric(pd.Series(values), errors="coerce").dropna().to_numpy(dtype="float64")
+        if not len(v):
+            return self
+        self.count += len(v)
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        self.zeros += int((v == 0).sum())
+        if (v > 0).any():
+            self.positive = self.positive.add(self._buckets(v[v > 0]), fill_value=0).astype("int64")
+        if (v < 0).any():
+            self.negative = self.negative.add(self._buckets(-v[v < 0]), fill_value=0).astype("int64")
+        return self
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative_accuracy")
+        self.positive = self.positive.add(other.positive, fill_value=0).astype("int64")
+        self.negative = self.negative.add(other.negative, fill_value=0).astype("int64")
+        self.zeros += other.zeros
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        qs = np.atleast_1d(np.asarray(q, dtype="float64"))
+        if self.count == 0:
+            est = np.full(len(qs), np.nan)
+        else:
+            neg = self.negative.sort_index(ascending=False)
+            pos = self.positive.sort_index()
+            mid = 2 / (self.gamma + 1)
+            values = np.concatenate([
+                -mid * self.gamma ** neg.index.to_numpy(dtype="float64"),
+                [0.0],
+                mid * self.gamma ** pos.index.to_numpy(dtype="float64"),
+            ])
+            counts = np.concatenate([neg.to_numpy(), [self.zeros], pos.to_numpy()])
+            rank = qs * (self.count - 1)
+            idx = np.searchsorted(np.cumsum(counts), rank, side="right")
+            est = np.clip(values[np.minimum(idx, len(values) - 1)], self.min, self.max)
+            est = np.where(qs <= 0, self.min, np.where(qs >= 1, self.max, est))
+        return float(est[0]) if np.ndim(q) == 0 else est
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "zeros": self.zeros,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "positive": {str(k): int(v) for k, v in self.positive.items()},
+            "negative": {str(k): int(v) for k, v in self.negative.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(d["relative_accuracy"])
+        sketch.count = d["count"]
+        sketch.zeros = d["zeros"]
+        if d["count"]:
+            sketch.min, sketch.max = d["min"], d["max"]
+        for side in ("positive", "negative"):
+            buckets = pd.Series({int(k): v for k, v in d[side].items()}, dtype="int64")
+            setattr(sketch, side, buckets)
+        return sketch
+
+
+class CorrelationAccumulator:
+    """
+    Pairwise covariance / correlation in one pass (Chan-Welford merge).
+    For every column pair it keeps the count, means, squared deviations and
+    co-moment over rows where both values are present, so corr() matches
+    DataFrame.corr() (pairwise NaN handling) however the rows were chunked.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = None if columns is None else list(columns)
+        self.n = self.mean = self.m2 = self.comoment = None
+
+    def _chunk_stats(self, chunk):
+        if self.columns is None:
+            self.columns = list(chunk.select_dtypes(include=["number", "bool"]).columns)
+        x = chunk[self.columns].to_numpy(dtype="float64", na_value=np.nan)
+        valid = ~np.isnan(x)
+        w = valid.astype("float64")
+        # shift by the column means so the sums below don't lose precision
+        shift = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+        d = np.where(valid, x - shift, 0.0)
+        n = w.T @ w
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (d.T @ w) / n
+            m2 = (d ** 2).T @ w - mean ** 2 * n
+            comoment = d.T @ d - mean * mean.T * n
+        return n, np.nan_to_num(mean + shift[:, None]), m2, comoment
+
+    def _combine(self, n, mean, m2, comoment):
+        if self.n is None:
+            self.n, self.mean, self.m2, self.comoment = n, mean, m2, comoment
+            return self
+        total = self.n + n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, self.n * n / total, 0.0)
+            delta = mean - self.mean
+            self.m2 = np.nan_to_num(self.m2) + np.nan_to_num(m2) + delta ** 2 * weight
+            self.comoment = np.nan_to_num(self.comoment) + np.nan_to_num(comoment) + delta * delta.T * weight
+            self.mean = np.where(total > 0, self.mean + delta * np.where(total > 0, n / total, 0.0), 0.0)
+        self.n = total
+        return self
+
+    def update(self, chunk):
+        if len(chunk):
+            self._combine(*self._chunk_stats(chunk))
+        return self
+
+    def merge(self, other):
+        if other.n is None:
+            return self
+        if self.columns is not None and self.columns != other.columns:
+            raise ValueError("Cannot merge accumulators over different columns")
+        self.columns = other.columns
+        return self._combine(other.n, other.mean, other.m2, other.comoment)
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def cov(self, ddof=1):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._frame(np.where(self.n > ddof, self.comoment / (self.n - ddof), np.nan))
+
+    def corr(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = np.clip(self.comoment / np.sqrt(self.m2 * self.m2.T), -1, 1)
+        r = np.where(self.n > 1, r, np.nan)
+        np.fill_diagonal(r, np.where(np.isnan(np.diag(r)), np.nan, 1.0))
+        return self._frame(r)
+
+    def to_dict(self):
+        return {
+            "columns": self.columns,
+            **{k: None if getattr(self, k) is None else getattr(self, k).tolist()
+               for k in ("n", "mean", "m2", "comoment")},
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        acc = cls(d["columns"])
+        if d["n"] is not None:
+            acc.n, acc.mean, acc.m2, acc.comoment = (np.array(d[k], dtype="float64") for k in ("n", "mean", "m2", "comoment"))
+        return acc
+
+
+def correlation_matrix(source, columns=None, chunksize=1_000_000):
+    """DataFrame.corr() over a DataFrame (taken CHUNK_SIZE rows at a time) or any chunk iterable."""
+    chunks = source
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[i:i + chunksize] for i in range(0, len(source), chunksize))
+    acc = CorrelationAccumulator(columns)
+    for chunk in chunks:
+        acc.update(chunk)
+    return acc.corr()